@@ -1,42 +1,74 @@
-import time
 import datetime
+import functools
+import threading
+import numpy as np
 import pandas as pd
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from nba_api.stats.endpoints import scoreboardv2, boxscoretraditionalv3, playercareerstats, playergamelog, leaguedashteamstats
 from lib.prediction_engine import PredictionEngine
+from lib.rate_limiter import RateLimiter
+from lib.utils import parse_minutes_col, prepare_game_log, games_before, narrow_boxscore
+import lib.cache as cache
+import lib.nba_session as nba_session
+import lib.fast_json as fast_json
 
-import json
 import os
 import lib.constants as constants
 
+fast_json.install()
+nba_session.install()
+
 # Constants
-SEASON = '2025-26' 
+SEASON = constants.SEASON
 API_DELAY = 0.6
-BASELINE_CACHE = {}
+GAME_WORKERS = 4      # Games processed concurrently
+SNAPSHOT_WORKERS = 3  # One per checkpoint (Q1, Q2, Q3)
+SUMMARY_EVERY = 10    # Games between running summaries
+BASELINE_CACHE = {}  # player_id -> (season_row, logs_df), see _fetch_player_raw
+SIGMA_CACHE = {}     # (player_id, cutoff) -> (sigma_pts, sigma_reb, sigma_ast), see _recent_sigmas
+DEFAULT_SIGMAS = (5.0, 2.0, 2.0)  # PTS, REB, AST when there are too few past games
 TEAM_DEF_RATINGS = {}
 
+# Shared across worker threads: one request budget, one cache, one aggregator
+API_LIMITER = RateLimiter(API_DELAY)
+BASELINE_CACHE_LOCK = threading.RLock()
+PLAYER_FETCH_LOCKS = defaultdict(threading.Lock)
+AGGREGATOR_LOCK = threading.Lock()
+SNAPSHOT_EXECUTOR = ThreadPoolExecutor(max_workers=SNAPSHOT_WORKERS)
+
+# Aggregator layout: int64 array of shape (quarter, stat, counter)
+QTR_IDX = {'Q1': 0, 'Q2': 1, 'Q3': 2}
+STAT_IDX = {'AST': 0, 'PTS': 1, 'REB': 2}  # Alphabetical, the order results are printed in
+COUNTERS = ['total', 'floor_hits', 'p25_hits', 'p50_hits']
+SNAPSHOT_FIELDS = ('minutes', 'foulsPersonal', 'points', 'reboundsTotal', 'assists')  # Kept per player, see get_boxscore_snapshot
+STRATEGY_QUANTILES = np.array([0.0, 0.25, 0.50])  # Floor, 25th and 50th percentile of the range
+
+# One row per (game, checkpoint, stat) in constants.BACKTEST_RESULTS_FILE
+RESULT_COLUMNS = ['date', 'game_id', 'label', 'stat', 'floor_hits', 'p25_hits', 'p50_hits', 'total']
+
+def _fetch_team_stats(measure_type):
+    """Fetches one LeagueDashTeamStats table (e.g. 'Advanced' or 'Opponent')."""
+    API_LIMITER.wait()
+    teams = leaguedashteamstats.LeagueDashTeamStats(
+        season=SEASON,
+        measure_type_detailed_defense=measure_type,
+        timeout=10
+    )
+    return teams.league_dash_team_stats.get_data_frame()
+
 def fetch_team_defense():
     """Fetches team defensive ratings and pace for DvP adjustments."""
     global TEAM_DEF_RATINGS
     print("Fetching Team Stats (Defense & Pace)...")
     try:
-        # 1. Fetch Advanced Team Stats (for PACE)
-        teams_adv = leaguedashteamstats.LeagueDashTeamStats(
-            season=SEASON,
-            measure_type_detailed_defense='Advanced',
-            timeout=10
-        )
-        df_adv = teams_adv.league_dash_team_stats.get_data_frame()
-        time.sleep(API_DELAY)
-
-        # 2. Fetch Opponent Stats (for OPP_PTS, OPP_REB, OPP_AST)
-        teams_opp = leaguedashteamstats.LeagueDashTeamStats(
-            season=SEASON,
-            measure_type_detailed_defense='Opponent',
-            timeout=10
-        )
-        df_opp = teams_opp.league_dash_team_stats.get_data_frame()
-        time.sleep(API_DELAY)
+        # Advanced (for PACE) and Opponent (for OPP_PTS, OPP_REB, OPP_AST) are
+        # independent, so both requests are in flight at once
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            adv_future = executor.submit(_fetch_team_stats, 'Advanced')
+            opp_future = executor.submit(_fetch_team_stats, 'Opponent')
+            df_adv = adv_future.result()
+            df_opp = opp_future.result()
         
         if not df_adv.empty and not df_opp.empty:
             # Calculate League Averages
@@ -47,21 +79,21 @@ def fetch_team_defense():
 
             print(f"League Averages - Pace: {avg_pace:.2f}, OppPTS: {avg_opp_pts:.1f}, OppREB: {avg_opp_reb:.1f}, OppAST: {avg_opp_ast:.1f}")
 
-            for _, row in df_adv.iterrows():
-                team_id = row['TEAM_ID']
-                # Find corresponding row in df_opp
-                opp_row = df_opp[df_opp['TEAM_ID'] == team_id].iloc[0]
-                
-                TEAM_DEF_RATINGS[team_id] = {
-                    'pace': row['PACE'],
-                    'opp_pts': opp_row['OPP_PTS'],
-                    'opp_reb': opp_row['OPP_REB'],
-                    'opp_ast': opp_row['OPP_AST'],
-                    'league_avg_pace': avg_pace,
-                    'league_avg_opp_pts': avg_opp_pts,
-                    'league_avg_opp_reb': avg_opp_reb,
-                    'league_avg_opp_ast': avg_opp_ast
-                }
+            # Join the two tables on TEAM_ID in one hash merge
+            merged = df_adv[['TEAM_ID', 'PACE']].merge(
+                df_opp[['TEAM_ID', 'OPP_PTS', 'OPP_REB', 'OPP_AST']], on='TEAM_ID'
+            ).rename(columns={
+                'PACE': 'pace',
+                'OPP_PTS': 'opp_pts',
+                'OPP_REB': 'opp_reb',
+                'OPP_AST': 'opp_ast'
+            }).assign(
+                league_avg_pace=avg_pace,
+                league_avg_opp_pts=avg_opp_pts,
+                league_avg_opp_reb=avg_opp_reb,
+                league_avg_opp_ast=avg_opp_ast
+            )
+            TEAM_DEF_RATINGS.update(merged.set_index('TEAM_ID').to_dict('index'))
             print(f"Fetched detailed stats for {len(TEAM_DEF_RATINGS)} teams.")
         else:
             print("Could not fetch team stats.")
@@ -69,17 +101,30 @@ def fetch_team_defense():
         print(f"Error fetching team defense: {e}")
 
 def load_baselines_from_file():
-    """Loads baselines from the researcher's file to speed up backtesting."""
+    """
+    Seeds BASELINE_CACHE from the researcher's file to speed up backtesting.
+
+    Only the raw season totals and game logs are used (the saved stats are already
+    adjusted for one specific matchup), and only if the file is for SEASON.
+    """
     global BASELINE_CACHE
     if os.path.exists(constants.BASELINES_FILE):
         try:
-            with open(constants.BASELINES_FILE, 'r') as f:
-                data = json.load(f)
-                if 'players' in data:
-                    print(f"Loaded {len(data['players'])} players from {constants.BASELINES_FILE}")
-                    # Flatten structure: {pid: stats}
-                    for pid, pdata in data['players'].items():
-                        BASELINE_CACHE[str(pid)] = pdata['stats']
+            data = fast_json.load_file(constants.BASELINES_FILE)
+            season = data.get('_meta', {}).get('season')
+            if season != SEASON:
+                print(f"Skipping {constants.BASELINES_FILE}: season {season} != {SEASON}")
+                return
+            loaded = 0
+            for pid, pdata in data.get('players', {}).items():
+                raw = pdata.get('raw')
+                if raw is None:
+                    continue
+                season_row = pd.Series(raw['season_totals'])
+                logs_df = prepare_game_log(pd.DataFrame(raw['game_log']))
+                BASELINE_CACHE[int(pid)] = (season_row, logs_df)
+                loaded += 1
+            print(f"Loaded {loaded} players from {constants.BASELINES_FILE}")
         except Exception as e:
             print(f"Error loading baselines file: {e}")
 
@@ -95,9 +140,17 @@ def get_dates_last_month():
 
 def get_games_for_date(date_str):
     """Fetches game IDs for a specific date."""
-    try:
+    def fetch():
+        API_LIMITER.wait()
         board = scoreboardv2.ScoreboardV2(game_date=date_str)
-        games = board.game_header.get_data_frame()
+        return board.game_header.get_data_frame()
+
+    # Past schedules are final; today's may still change, so only keep it briefly.
+    is_past = date_str < datetime.date.today().strftime('%Y-%m-%d')
+    ttl = cache.NEVER_EXPIRE if is_past else 3600
+
+    try:
+        games = cache.get_or_fetch(f"scoreboard:{date_str}", fetch, ttl)
         if games.empty:
             return []
         # Return list of dicts with team info
@@ -106,31 +159,66 @@ def get_games_for_date(date_str):
         print(f"Error fetching games for {date_str}: {e}")
         return []
 
-def get_player_baseline(player_id, game_date, is_home, opponent_id):
-    """Fetches baseline stats for a player, with caching."""
-    # Cache key needs to include date/home/opp now, or we just cache the raw stats and adjust dynamically.
-    # To keep it simple and fast, let's cache the RAW season/log data, and do the adjustments every time.
-    # But BASELINE_CACHE currently stores the final dict.
-    # Let's change the cache key to include the context: f"{player_id}_{game_date}"
-    
-    cache_key = f"{player_id}_{game_date}_{is_home}_{opponent_id}"
-    if cache_key in BASELINE_CACHE:
-        return BASELINE_CACHE[cache_key]
+def _fetch_player_raw(player_id):
+    """
+    Fetches a player's current season totals and game log.
+
+    These depend only on player_id, so they are fetched once per player and shared
+    by every game/date the player appears in. Returns (season_row, logs_df), or None
+    if the player has no usable season. logs_df carries a parsed `date_dt` column
+    and is sorted newest first.
+    """
+    with BASELINE_CACHE_LOCK:
+        if player_id in BASELINE_CACHE:
+            return BASELINE_CACHE[player_id]
+        player_lock = PLAYER_FETCH_LOCKS[player_id]
+
+    # One thread fetches a given player; concurrent callers wait and then hit the cache
+    with player_lock:
+        with BASELINE_CACHE_LOCK:
+            if player_id in BASELINE_CACHE:
+                return BASELINE_CACHE[player_id]
+
+        raw = None
 
-    try:
         # 1. Get Season Averages
+        API_LIMITER.wait()
         career = playercareerstats.PlayerCareerStats(player_id=player_id)
         season_df = career.season_totals_regular_season.get_data_frame()
-        time.sleep(API_DELAY)
 
-        if season_df.empty:
-            return None
+        if not season_df.empty and season_df.iloc[-1]['MIN'] >= 50:
+            # 2. Get Recent Game Logs (filtered by date per call)
+            API_LIMITER.wait()
+            gamelog = playergamelog.PlayerGameLog(player_id=player_id, season=SEASON)
+            logs_df = gamelog.player_game_log.get_data_frame()
+            raw = (season_df.iloc[-1], prepare_game_log(logs_df))
+
+        with BASELINE_CACHE_LOCK:
+            BASELINE_CACHE[player_id] = raw
+        return raw
+
+def _recent_sigmas(player_id, past_logs, cutoff):
+    """Sample std of PTS/REB/AST over the last 20 games before the cutoff, cached per (player, cutoff)."""
+    key = (player_id, cutoff)
+    sigmas = SIGMA_CACHE.get(key)
+    if sigmas is None:
+        recent = past_logs.head(20)[['PTS', 'REB', 'AST']].to_numpy(dtype=float) if not past_logs.empty else None
+        if recent is None or len(recent) < 2:
+            sigmas = DEFAULT_SIGMAS
+        else:
+            sigmas = tuple(np.std(recent, axis=0, ddof=1).tolist())
+        SIGMA_CACHE[key] = sigmas
+    return sigmas
 
-        current_season = season_df.iloc[-1]
-        minutes = current_season['MIN']
-        if minutes < 50: 
+def get_player_baseline(player_id, game_date, is_home, opponent_id):
+    """Builds a player's baseline as of game_date from their cached raw stats."""
+    try:
+        raw = _fetch_player_raw(player_id)
+        if raw is None:
             return None
+        current_season, logs_df = raw
 
+        minutes = current_season['MIN']
         games_played = current_season['GP']
         
         season_pts_min = current_season['PTS'] / minutes
@@ -138,24 +226,8 @@ def get_player_baseline(player_id, game_date, is_home, opponent_id):
         season_ast_min = current_season['AST'] / minutes
         avg_minutes = minutes / games_played
 
-        # 2. Get Recent Game Logs (Filtered by Date)
-        gamelog = playergamelog.PlayerGameLog(player_id=player_id, season=SEASON)
-        logs_df = gamelog.player_game_log.get_data_frame()
-        time.sleep(API_DELAY)
-
         # Filter logs to only include games BEFORE the backtest date
-        if not logs_df.empty:
-            # Convert GAME_DATE to datetime for comparison
-            # API format is usually "OCT 29, 2024" or similar. 
-            # Actually, let's check the format. It's usually 'YYYY-MM-DD' in some endpoints or 'MMM DD, YYYY' in others.
-            # In research_api output it was "Apr 11, 2025".
-            # We need to parse it.
-            logs_df['date_dt'] = pd.to_datetime(logs_df['GAME_DATE'])
-            target_dt = pd.to_datetime(game_date)
-            
-            past_logs = logs_df[logs_df['date_dt'] < target_dt]
-        else:
-            past_logs = pd.DataFrame()
+        past_logs, cutoff = games_before(logs_df, game_date)
 
         # --- Weighted Baseline ---
         if not past_logs.empty:
@@ -203,17 +275,9 @@ def get_player_baseline(player_id, game_date, is_home, opponent_id):
             baseline_ast_min *= (pace_modifier * ast_modifier)
 
         # --- Variance (Sigma) ---
-        if past_logs.empty:
-            sigma_pts = 5.0
-            sigma_reb = 2.0
-            sigma_ast = 2.0
-        else:
-            recent_logs = past_logs.head(20)
-            sigma_pts = recent_logs['PTS'].std() if not pd.isna(recent_logs['PTS'].std()) else 5.0
-            sigma_reb = recent_logs['REB'].std() if not pd.isna(recent_logs['REB'].std()) else 2.0
-            sigma_ast = recent_logs['AST'].std() if not pd.isna(recent_logs['AST'].std()) else 2.0
+        sigma_pts, sigma_reb, sigma_ast = _recent_sigmas(player_id, past_logs, cutoff)
 
-        baseline = {
+        return {
             'baseline_pts_min': baseline_pts_min,
             'baseline_reb_min': baseline_reb_min,
             'baseline_ast_min': baseline_ast_min,
@@ -222,28 +286,55 @@ def get_player_baseline(player_id, game_date, is_home, opponent_id):
             'sigma_reb': sigma_reb,
             'sigma_ast': sigma_ast
         }
-
-        BASELINE_CACHE[cache_key] = baseline
-        return baseline
     except Exception as e:
         print(f"Error getting baseline for {player_id}: {e}")
         return None
 
 def get_boxscore_snapshot(game_id, end_range):
-    """Fetches boxscore for a specific range."""
-    try:
+    """
+    Fetches boxscore for a specific range. Completed games never change, so it is cached on disk.
+
+    Returns ({personId: {field: value}}, {teamId: points}). Only SNAPSHOT_FIELDS are kept,
+    read straight from the raw rows without building a DataFrame.
+    """
+    def fetch():
+        API_LIMITER.wait()
         box = boxscoretraditionalv3.BoxScoreTraditionalV3(
             game_id=game_id,
             range_type="2",
             start_range="0",
             end_range=str(end_range)
         )
-        return box.player_stats.get_data_frame()
+        raw = box.player_stats.get_dict()
+        col = {name: i for i, name in enumerate(raw['headers'])}
+
+        players = {}
+        team_points = {}
+        for row in raw['data']:
+            team_id = row[col['teamId']]
+            team_points[team_id] = team_points.get(team_id, 0) + (row[col['points']] or 0)
+            # First row wins if a player is listed twice
+            players.setdefault(row[col['personId']], {field: row[col[field]] for field in SNAPSHOT_FIELDS})
+        return players, team_points
+
+    try:
+        return cache.get_or_fetch(f"boxscore:{game_id}:{end_range}:rows", fetch)
     except Exception as e:
         print(f"Error fetching snapshot {end_range} for {game_id}: {e}")
-        return pd.DataFrame()
+        return {}, {}
 
+def get_full_boxscore(game_id):
+    """Fetches the final boxscore (ground truth), cached on disk like the snapshots."""
+    def fetch():
+        API_LIMITER.wait()
+        full_box = boxscoretraditionalv3.BoxScoreTraditionalV3(game_id=game_id)
+        return full_box.player_stats.get_data_frame()
+
+    return narrow_boxscore(cache.get_or_fetch(f"boxscore:{game_id}:full", fetch))
+
+@functools.lru_cache(maxsize=4096)
 def parse_minutes(min_str):
+    # Only a few thousand distinct "MM:SS" values exist, so repeats are a cache hit
     try:
         parts = min_str.split(':')
         return int(parts[0]) + int(parts[1])/60
@@ -258,10 +349,21 @@ def process_game(game_info, game_date, aggregator):
     
     print(f"  Processing Game {game_id}...")
     
-    # 1. Ground Truth
+    # 1. Snapshots: request every checkpoint up front so they are in flight while the
+    #    full box downloads; API_LIMITER keeps all four calls spaced out
+    checkpoints = {
+        "Q1": 7200,
+        "Q2": 14400, # Halftime
+        "Q3": 21600
+    }
+    futures = {
+        SNAPSHOT_EXECUTOR.submit(get_boxscore_snapshot, game_id, rng): label
+        for label, rng in checkpoints.items()
+    }
+
+    # 2. Ground Truth
     try:
-        full_box = boxscoretraditionalv3.BoxScoreTraditionalV3(game_id=game_id)
-        full_df = full_box.player_stats.get_data_frame()
+        full_df = get_full_boxscore(game_id)
     except Exception as e:
         print(f"    Failed to fetch full box: {e}")
         return
@@ -269,179 +371,195 @@ def process_game(game_info, game_date, aggregator):
     if full_df.empty:
         return
 
-    full_df['min_float'] = full_df['minutes'].apply(parse_minutes)
+    full_df['min_float'] = parse_minutes_col(full_df['minutes'])
     significant_players = full_df[full_df['min_float'] > 20]
     
     if significant_players.empty:
         return
 
-    # 2. Snapshots
-    checkpoints = {
-        "Q1": 7200,
-        "Q2": 14400, # Halftime
-        "Q3": 21600
-    }
-    
     snapshots = {}
-    for label, rng in checkpoints.items():
-        snapshots[label] = get_boxscore_snapshot(game_id, rng)
-        time.sleep(API_DELAY)
-
-    # 3. Evaluate
-    for _, player in significant_players.iterrows():
-        player_id = player['personId']
-        team_id = player['teamId']
-        
-        # Determine Home/Away and Opponent
-        is_home = (team_id == home_team_id)
-        opponent_id = visitor_team_id if is_home else home_team_id
-        
-        baseline = get_player_baseline(player_id, game_date, is_home, opponent_id)
-        if not baseline:
+    for future in as_completed(futures):
+        snapshots[futures[future]] = future.result()
+    # Keep evaluation order stable (Q1, Q2, Q3)
+    snapshots = {label: snapshots[label] for label in checkpoints}
+
+    # 3. Baselines (one lookup per player; the rest of the evaluation is vectorized)
+    players = significant_players.copy()
+    players['is_home'] = players['teamId'] == home_team_id
+    players['opponent_id'] = np.where(players['is_home'], visitor_team_id, home_team_id)
+
+    baselines = [
+        get_player_baseline(player_id, game_date, is_home, opponent_id)
+        for player_id, is_home, opponent_id in zip(players['personId'], players['is_home'], players['opponent_id'])
+    ]
+    has_baseline = [baseline is not None for baseline in baselines]
+    players = players[has_baseline]
+    if players.empty:
+        return
+    players = players.join(pd.DataFrame([b for b in baselines if b is not None], index=players.index))
+
+    avg_minutes = players['avg_minutes'].to_numpy()
+
+    # Stats are evaluated together as the columns of (players, 3) arrays
+    stat_names = ['PTS', 'REB', 'AST']
+    stat_cols = ['points', 'reboundsTotal', 'assists']
+    finals = players[stat_cols].to_numpy(dtype=float)
+    baselines = players[['baseline_pts_min', 'baseline_reb_min', 'baseline_ast_min']].to_numpy(dtype=float)
+    sigmas = players[['sigma_pts', 'sigma_reb', 'sigma_ast']].to_numpy(dtype=float)
+    period_map = {"Q1": 1, "Q2": 2, "Q3": 3}
+
+    # Per-checkpoint hit counts, aggregated with one groupby at the end of the game
+    result_frames = []
+
+    # 4. Evaluate every player at each checkpoint in one pass
+    for label, (snapshot_players, team_scores) in snapshots.items():
+        if not snapshot_players:
             continue
 
-        final_stats = {
-            'PTS': player['points'],
-            'REB': player['reboundsTotal'],
-            'AST': player['assists']
-        }
+        # Players missing from the snapshot haven't checked in yet (zero stats)
+        snap_rows = [snapshot_players.get(player_id, {}) for player_id in players['personId']]
+        cur_min = np.array([parse_minutes(row.get('minutes')) for row in snap_rows])
+        cur_fouls = np.array([row.get('foulsPersonal') or 0 for row in snap_rows], dtype=float)
+        cur_stats = np.array([[row.get(col) or 0 for col in stat_cols] for row in snap_rows], dtype=float)
 
-        for label, snapshot_df in snapshots.items():
-            if snapshot_df.empty:
-                continue
-                
-            p_snap = snapshot_df[snapshot_df['personId'] == player_id]
-            if p_snap.empty:
-                cur_stats = {'PTS': 0, 'REB': 0, 'AST': 0}
-                cur_min = 0.0
-                cur_fouls = 0
-            else:
-                p_data = p_snap.iloc[0]
-                cur_stats = {
-                    'PTS': p_data['points'],
-                    'REB': p_data['reboundsTotal'],
-                    'AST': p_data['assists']
-                }
-                cur_min = parse_minutes(p_data['minutes'])
-                cur_fouls = p_data['foulsPersonal']
-
-            # Calculate Score Differential
-            # Group by teamId to get team scores
-            team_scores = snapshot_df.groupby('teamId')['points'].sum()
-            
-            # Determine my team and opp team score
-            my_score = team_scores.get(team_id, 0)
-            opp_score = team_scores.get(opponent_id, 0)
-            score_diff = my_score - opp_score
-
-            # Map label to period number
-            period_map = {"Q1": 1, "Q2": 2, "Q3": 3}
-            period = period_map.get(label, 0)
-
-            # Calc Prediction
-            # Use PTS pace for performance factor (Hot Hand)
-            if cur_min > 0:
-                cur_pace_pts = cur_stats['PTS'] / cur_min
-            else:
-                cur_pace_pts = 0
-                
-            perf_factor = PredictionEngine.calculate_performance_factor(cur_pace_pts, baseline['baseline_pts_min'])
-            
-            # Use new method for remaining minutes
-            rm = PredictionEngine.calculate_dynamic_remaining_minutes(
-                baseline['avg_minutes'], 
-                cur_min, 
-                cur_fouls, 
-                score_diff, 
-                period,
-                perf_factor
-            )
+        # Score Differential from each player's perspective
+        my_score = players['teamId'].map(team_scores).fillna(0).to_numpy()
+        opp_score = players['opponent_id'].map(team_scores).fillna(0).to_numpy()
+        score_diff = my_score - opp_score
 
-            stat_types = [
-                ('PTS', 'baseline_pts_min', 'sigma_pts'),
-                ('REB', 'baseline_reb_min', 'sigma_reb'),
-                ('AST', 'baseline_ast_min', 'sigma_ast')
-            ]
+        period = period_map.get(label, 0)
 
-            for stat_name, base_key, sigma_key in stat_types:
-                pfs = PredictionEngine.calculate_pfs(
-                    cur_stats[stat_name], baseline[base_key], rm, period
-                )
-                low, high, _ = PredictionEngine.get_prediction_range(
-                    pfs, baseline[sigma_key], cur_min, baseline['avg_minutes'], cur_stats[stat_name]
-                )
-                
-                # Strategy 1: Floor (Low End of Range)
-                # Bet OVER if Line <= Low.
-                # Hit if Final >= Low.
-                floor_threshold = low
-                is_floor_hit = final_stats[stat_name] >= floor_threshold
-
-                # Strategy 2: 25th Percentile
-                # Bet OVER if Line <= 25th Percentile.
-                # Hit if Final >= 25th Percentile.
-                p25_threshold = low + 0.25 * (high - low)
-                is_p25_hit = final_stats[stat_name] >= p25_threshold
-
-                # Strategy 3: 50th Percentile (Median)
-                # Bet OVER if Line <= 50th Percentile.
-                # Hit if Final >= 50th Percentile.
-                p50_threshold = low + 0.50 * (high - low)
-                is_p50_hit = final_stats[stat_name] >= p50_threshold
-                
-                aggregator[(label, stat_name)]['total'] += 1
-                if is_floor_hit:
-                    aggregator[(label, stat_name)]['floor_hits'] += 1
-                if is_p25_hit:
-                    aggregator[(label, stat_name)]['p25_hits'] += 1
-                if is_p50_hit:
-                    aggregator[(label, stat_name)]['p50_hits'] += 1
+        # Per-player values broadcast across the stat columns (PTS pace drives the Hot Hand)
+        _, low, high, _, _ = PredictionEngine.predict_stats_vec(
+            cur_stats, baselines, sigmas, cur_min, avg_minutes, cur_fouls, score_diff, period
+        )
+
+        # Strategies (bet OVER if Line <= threshold, hit if Final >= threshold):
+        # 1. Floor (Low End of Range), 2. 25th Percentile, 3. 50th Percentile (Median)
+        thresholds = low + STRATEGY_QUANTILES[:, None, None] * (high - low)
+        hits = (finals >= thresholds).sum(axis=1)  # (strategy, stat)
+        result_frames.append(pd.DataFrame({
+            'label': label,
+            'stat': stat_names,
+            'floor_hits': hits[0],
+            'p25_hits': hits[1],
+            'p50_hits': hits[2],
+            'total': len(finals)
+        }))
+
+    if not result_frames:
+        return
+    game_agg = pd.concat(result_frames, ignore_index=True).groupby(['label', 'stat']).sum()
+    game_results = game_agg.reset_index().assign(date=game_date, game_id=game_id)[RESULT_COLUMNS]
+
+    with AGGREGATOR_LOCK:
+        save_game_results(game_results)
+        add_results(aggregator, game_results)
+
+def new_aggregator():
+    """Returns an empty (quarter, stat, counter) aggregator, see QTR_IDX/STAT_IDX/COUNTERS."""
+    return np.zeros((len(QTR_IDX), len(STAT_IDX), len(COUNTERS)), dtype=np.int64)
+
+def add_results(aggregator, results):
+    """Adds per-game result rows into the aggregator array in place."""
+    q = results['label'].map(QTR_IDX).to_numpy(dtype=np.intp)
+    s = results['stat'].map(STAT_IDX).to_numpy(dtype=np.intp)
+    np.add.at(aggregator, (q, s), results[COUNTERS].to_numpy(dtype=np.int64))
+
+def format_result_rows(aggregator):
+    """Formats one table row per (quarter, stat) that has samples."""
+    totals = aggregator[:, :, 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratios = aggregator[:, :, 1:] / totals[:, :, None] * 100
+
+    rows = []
+    for qtr, q in QTR_IDX.items():
+        for stat, s in STAT_IDX.items():
+            total = totals[q, s]
+            if total == 0: continue
+            floor_ratio, p25_ratio, p50_ratio = ratios[q, s]
+            rows.append(f"{qtr:<5} | {stat:<5} | {floor_ratio:<6.1f}%  | {p25_ratio:<6.1f}%  | {p50_ratio:<6.1f}%  | {total:<6}")
+    return rows
+
+def save_game_results(game_results):
+    """Appends one game's results to the results file. Caller holds AGGREGATOR_LOCK."""
+    path = constants.BACKTEST_RESULTS_FILE
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_header = not os.path.exists(path)
+    # One write per game, so an interrupted run never leaves a game half-recorded
+    with open(path, 'a', newline='') as f:
+        f.write(game_results.to_csv(header=write_header, index=False))
+
+def load_previous_results(target_dates):
+    """Loads results saved by earlier runs for the dates in this backtest window."""
+    path = constants.BACKTEST_RESULTS_FILE
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+    try:
+        results = pd.read_csv(path, dtype={'date': str, 'game_id': str})
+    except Exception as e:
+        print(f"Could not read previous results from {path}: {e}")
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+    return results[results['date'].isin(target_dates)]
 
 def print_running_summary(aggregator, total_games_processed):
-    print(f"\n--- Running Stats ({total_games_processed} Games) ---")
-    print(f"{'QTR':<5} | {'STAT':<5} | {'FLOOR %':<8} | {'25th %':<8} | {'50th %':<8} | {'SAMPLE':<6}")
-    
-    sorted_keys = sorted(aggregator.keys())
-    for qtr, stat in sorted_keys:
-        data = aggregator[(qtr, stat)]
-        total = data['total']
-        if total == 0: continue
-        
-        floor_ratio = (data['floor_hits'] / total * 100)
-        p25_ratio = (data['p25_hits'] / total * 100)
-        p50_ratio = (data['p50_hits'] / total * 100)
-        
-        print(f"{qtr:<5} | {stat:<5} | {floor_ratio:<6.1f}%  | {p25_ratio:<6.1f}%  | {p50_ratio:<6.1f}%  | {total:<6}")
+    lines = [
+        f"\n--- Running Stats ({total_games_processed} Games) ---",
+        f"{'QTR':<5} | {'STAT':<5} | {'FLOOR %':<8} | {'25th %':<8} | {'50th %':<8} | {'SAMPLE':<6}"
+    ]
+    lines += format_result_rows(aggregator)
+
+    # One write per summary instead of one per line
+    print("\n".join(lines))
 
 def main():
-    # load_baselines_from_file() # Disable file loading for now as we need dynamic calculation
+    load_baselines_from_file()
     fetch_team_defense()
     
-    # (Quarter, Stat) -> {floor_hits, p25_hits, p50_hits, total}
-    aggregator = defaultdict(lambda: {'floor_hits': 0, 'p25_hits': 0, 'p50_hits': 0, 'total': 0})
+    # (Quarter, Stat) -> [total, floor_hits, p25_hits, p50_hits]
+    aggregator = new_aggregator()
     
     target_dates = get_dates_last_month()
     
     print("Fetching games for the last 30 days...")
     
-    total_games_processed = 0
+    # Resume: games finished by an earlier (possibly interrupted) run are not re-processed
+    previous_results = load_previous_results(target_dates)
+    done_games = set(previous_results['game_id'])
+    add_results(aggregator, previous_results)
+    total_games_processed = len(done_games)
+    if done_games:
+        print(f"Resuming with {len(done_games)} games already processed.")
     
     # Use all dates for the full run
     # target_dates = dates[:1] # TEMPORARY LIMIT FOR VERIFICATION
     print(f"Processing {len(target_dates)} dates from {target_dates[0]} to {target_dates[-1]}")
 
+    executor = ThreadPoolExecutor(max_workers=GAME_WORKERS)
     try:
-        for date_str in target_dates:
+        # Schedules for every date are requested up front, and each date's games are
+        # queued as soon as its schedule arrives, so the pool never drains between dates.
+        schedules = executor.map(get_games_for_date, target_dates)
+
+        futures = []
+        for date_str, games in zip(target_dates, schedules):
             print(f"\n--- Date: {date_str} ---")
-            games = get_games_for_date(date_str)
             print(f"Found {len(games)} games.")
-            
-            for game in games:
-                process_game(game, date_str, aggregator)
-                total_games_processed += 1
-                print_running_summary(aggregator, total_games_processed)
+            futures += [
+                executor.submit(process_game, game, date_str, aggregator)
+                for game in games if game['GAME_ID'] not in done_games
+            ]
+
+        for future in as_completed(futures):
+            future.result()
+            total_games_processed += 1
+            if total_games_processed % SUMMARY_EVERY == 0:
+                with AGGREGATOR_LOCK:
+                    print_running_summary(aggregator, total_games_processed)
     except KeyboardInterrupt:
         print("\nRun interrupted by user. Showing partial results...")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
     print("\n" + "="*80)
     print(f"AGGREGATE BACKTEST RESULTS ({total_games_processed} Games)")
@@ -450,21 +568,9 @@ def main():
     print(f"{'QTR':<5} | {'STAT':<5} | {'FLOOR %':<8} | {'25th %':<8} | {'50th %':<8} | {'SAMPLE':<6}")
     print("-" * 80)
     
-    # Sort by Quarter then Stat
-    sorted_keys = sorted(aggregator.keys())
-    
-    for qtr, stat in sorted_keys:
-        data = aggregator[(qtr, stat)]
-        floor_hits = data['floor_hits']
-        p25_hits = data['p25_hits']
-        p50_hits = data['p50_hits']
-        total = data['total']
-        
-        floor_ratio = (floor_hits / total * 100) if total > 0 else 0.0
-        p25_ratio = (p25_hits / total * 100) if total > 0 else 0.0
-        p50_ratio = (p50_hits / total * 100) if total > 0 else 0.0
-        
-        print(f"{qtr:<5} | {stat:<5} | {floor_ratio:<6.1f}%  | {p25_ratio:<6.1f}%  | {p50_ratio:<6.1f}%  | {total:<6}")
+    # Sorted by Quarter then Stat
+    for row in format_result_rows(aggregator):
+        print(row)
     print("="*80)
 
 if __name__ == "__main__":
@@ -1,30 +1,85 @@
-import time
+import functools
+import sys
+import threading
+import numpy as np
 import pandas as pd
 from collections import defaultdict
-from nba_api.stats.endpoints import scoreboardv2, boxscoretraditionalv3, playercareerstats, playergamelog, leaguedashteamstats
+from concurrent.futures import ThreadPoolExecutor
+from nba_api.stats.endpoints import scoreboardv2, boxscoretraditionalv3, playergamelog, leaguedashteamstats, leaguedashplayerstats
 from lib.prediction_engine import PredictionEngine
+from lib.rate_limiter import RateLimiter
+from lib.utils import parse_minutes_col, prepare_game_log, games_before, summarize_recent_logs, narrow_boxscore
+import lib.cache as cache
+import lib.nba_session as nba_session
 import lib.constants as constants
 import json
 import os
 import datetime
 
+nba_session.install()
+
 # Constants
-SEASON = '2025-26' 
+SEASON = constants.SEASON
 API_DELAY = 0.6
+GAME_WORKERS = 8      # Games analyzed concurrently
+BASELINE_WORKERS = 8  # Player baselines fetched concurrently
+SNAPSHOT_WORKERS = 8  # Q3 snapshots fetched alongside each game's full box
+# On-disk cache lifetimes (seconds) for the NBA API responses, see lib/cache.py
+LEAGUE_TOTALS_TTL = 24 * 3600
+GAMELOG_TTL = 24 * 3600
+TEAM_STATS_TTL = 3600
 TEAM_DEF_RATINGS = {}
+LEAGUE_TOTALS = {}  # player_id -> this season's MIN/GP/PTS/REB/AST totals
 BASELINE_CACHE = {}
+DEFAULT_SIGMAS = (5.0, 2.0, 2.0)  # PTS, REB, AST when there are too few past games
+
+# Shared across worker threads: one request budget, one cache
+API_LIMITER = RateLimiter(API_DELAY)
+BASELINE_CACHE_LOCK = threading.RLock()
+BASELINE_FETCH_LOCKS = defaultdict(threading.Lock)
+GAME_LOG_LOCKS = defaultdict(threading.Lock)
+BASELINE_EXECUTOR = ThreadPoolExecutor(max_workers=BASELINE_WORKERS)
+SNAPSHOT_EXECUTOR = ThreadPoolExecutor(max_workers=SNAPSHOT_WORKERS)
+
+def _fetch_team_stats(measure_type):
+    def fetch():
+        API_LIMITER.wait()
+        teams = leaguedashteamstats.LeagueDashTeamStats(season=SEASON, measure_type_detailed_defense=measure_type, timeout=10)
+        return teams.league_dash_team_stats.get_data_frame()
+    return cache.get_or_fetch(f"teamstats:{SEASON}:{measure_type}", fetch, TEAM_STATS_TTL)
+
+def _fetch_league_totals():
+    def fetch():
+        API_LIMITER.wait()
+        players = leaguedashplayerstats.LeagueDashPlayerStats(season=SEASON, per_mode_detailed='Totals', timeout=10)
+        return players.league_dash_player_stats.get_data_frame()
+    return cache.get_or_fetch(f"leaguetotals:{SEASON}", fetch, LEAGUE_TOTALS_TTL)
+
+def _fetch_game_log(player_id):
+    def fetch():
+        API_LIMITER.wait()
+        gamelog = playergamelog.PlayerGameLog(player_id=player_id, season=SEASON)
+        return gamelog.player_game_log.get_data_frame()
+    return cache.get_or_fetch(f"gamelog:{player_id}:{SEASON}", fetch, GAMELOG_TTL)
+
+@functools.lru_cache(maxsize=1024)
+def _load_game_log(player_id):
+    # Parsed and sorted once per player, then sliced by date for every game they appear in
+    return prepare_game_log(_fetch_game_log(player_id))
+
+def _prepared_game_log(player_id):
+    # The per-player lock keeps concurrent baselines for one player from loading the log twice
+    with BASELINE_CACHE_LOCK:
+        player_lock = GAME_LOG_LOCKS[player_id]
+    with player_lock:
+        return _load_game_log(player_id)
 
 def fetch_team_defense():
     global TEAM_DEF_RATINGS
     print("Fetching Team Stats (Defense & Pace)...")
     try:
-        teams_adv = leaguedashteamstats.LeagueDashTeamStats(season=SEASON, measure_type_detailed_defense='Advanced', timeout=10)
-        df_adv = teams_adv.league_dash_team_stats.get_data_frame()
-        time.sleep(API_DELAY)
-
-        teams_opp = leaguedashteamstats.LeagueDashTeamStats(season=SEASON, measure_type_detailed_defense='Opponent', timeout=10)
-        df_opp = teams_opp.league_dash_team_stats.get_data_frame()
-        time.sleep(API_DELAY)
+        df_adv = _fetch_team_stats('Advanced')
+        df_opp = _fetch_team_stats('Opponent')
         
         if not df_adv.empty and not df_opp.empty:
             avg_pace = df_adv['PACE'].mean()
@@ -32,33 +87,53 @@ def fetch_team_defense():
             avg_opp_reb = df_opp['OPP_REB'].mean()
             avg_opp_ast = df_opp['OPP_AST'].mean()
 
-            for _, row in df_adv.iterrows():
-                team_id = row['TEAM_ID']
-                opp_row = df_opp[df_opp['TEAM_ID'] == team_id].iloc[0]
-                TEAM_DEF_RATINGS[team_id] = {
-                    'pace': row['PACE'],
-                    'opp_pts': opp_row['OPP_PTS'],
-                    'opp_reb': opp_row['OPP_REB'],
-                    'opp_ast': opp_row['OPP_AST'],
-                    'league_avg_pace': avg_pace,
-                    'league_avg_opp_pts': avg_opp_pts,
-                    'league_avg_opp_reb': avg_opp_reb,
-                    'league_avg_opp_ast': avg_opp_ast
-                }
+            merged = df_adv[['TEAM_ID', 'PACE']].merge(
+                df_opp[['TEAM_ID', 'OPP_PTS', 'OPP_REB', 'OPP_AST']], on='TEAM_ID'
+            ).rename(columns={
+                'PACE': 'pace',
+                'OPP_PTS': 'opp_pts',
+                'OPP_REB': 'opp_reb',
+                'OPP_AST': 'opp_ast'
+            }).assign(
+                league_avg_pace=avg_pace,
+                league_avg_opp_pts=avg_opp_pts,
+                league_avg_opp_reb=avg_opp_reb,
+                league_avg_opp_ast=avg_opp_ast
+            )
+            TEAM_DEF_RATINGS.update(merged.set_index('TEAM_ID').to_dict('index'))
     except Exception as e:
         print(f"Error fetching team defense: {e}")
 
+def fetch_league_season_totals():
+    """Loads every player's season totals with one league-wide request."""
+    print("Fetching League Player Totals...")
+    try:
+        df = _fetch_league_totals()
+        if not df.empty:
+            LEAGUE_TOTALS.update(df.set_index('PLAYER_ID')[['MIN', 'GP', 'PTS', 'REB', 'AST']].to_dict('index'))
+    except Exception as e:
+        print(f"Error fetching league player totals: {e}")
+
 def get_player_baseline(player_id, game_date, is_home, opponent_id):
-    cache_key = f"{player_id}_{game_date}_{is_home}_{opponent_id}"
-    if cache_key in BASELINE_CACHE: return BASELINE_CACHE[cache_key]
+    cache_key = (player_id, game_date, bool(is_home), int(opponent_id))
+    with BASELINE_CACHE_LOCK:
+        if cache_key in BASELINE_CACHE: return BASELINE_CACHE[cache_key]
+        key_lock = BASELINE_FETCH_LOCKS[cache_key]
 
-    try:
-        career = playercareerstats.PlayerCareerStats(player_id=player_id)
-        season_df = career.season_totals_regular_season.get_data_frame()
-        time.sleep(API_DELAY)
+    # One thread computes a given baseline; concurrent callers wait and then hit the cache
+    with key_lock:
+        with BASELINE_CACHE_LOCK:
+            if cache_key in BASELINE_CACHE: return BASELINE_CACHE[cache_key]
+        baseline = _compute_player_baseline(player_id, game_date, is_home, opponent_id)
+        if baseline is not None:
+            with BASELINE_CACHE_LOCK:
+                BASELINE_CACHE[cache_key] = baseline
+        return baseline
 
-        if season_df.empty: return None
-        current_season = season_df.iloc[-1]
+def _compute_player_baseline(player_id, game_date, is_home, opponent_id):
+    try:
+        current_season = LEAGUE_TOTALS.get(player_id)
+        if current_season is None: return None
         minutes = current_season['MIN']
         if minutes < 50: return None
         games_played = current_season['GP']
@@ -68,24 +143,13 @@ def get_player_baseline(player_id, game_date, is_home, opponent_id):
         season_ast_min = current_season['AST'] / minutes
         avg_minutes = minutes / games_played
 
-        gamelog = playergamelog.PlayerGameLog(player_id=player_id, season=SEASON)
-        logs_df = gamelog.player_game_log.get_data_frame()
-        time.sleep(API_DELAY)
-
-        if not logs_df.empty:
-            logs_df['date_dt'] = pd.to_datetime(logs_df['GAME_DATE'])
-            target_dt = pd.to_datetime(game_date)
-            past_logs = logs_df[logs_df['date_dt'] < target_dt]
-        else:
-            past_logs = pd.DataFrame()
+        past_logs, _ = games_before(_prepared_game_log(player_id), game_date)
 
         if not past_logs.empty:
-            last_5 = past_logs.head(5)
-            l5_min = last_5['MIN'].sum()
+            l5_totals, l20_sigmas = summarize_recent_logs(past_logs)
+            l5_min = l5_totals[0]
             if l5_min > 0:
-                l5_pts_min = last_5['PTS'].sum() / l5_min
-                l5_reb_min = last_5['REB'].sum() / l5_min
-                l5_ast_min = last_5['AST'].sum() / l5_min
+                l5_pts_min, l5_reb_min, l5_ast_min = l5_totals[1:] / l5_min
                 baseline_pts_min = (0.7 * season_pts_min) + (0.3 * l5_pts_min)
                 baseline_reb_min = (0.7 * season_reb_min) + (0.3 * l5_reb_min)
                 baseline_ast_min = (0.7 * season_ast_min) + (0.3 * l5_ast_min)
@@ -107,14 +171,11 @@ def get_player_baseline(player_id, game_date, is_home, opponent_id):
             baseline_ast_min *= (pace_modifier * (stats['opp_ast'] / stats['league_avg_opp_ast']))
 
         if past_logs.empty:
-            sigma_pts, sigma_reb, sigma_ast = 5.0, 2.0, 2.0
+            sigma_pts, sigma_reb, sigma_ast = DEFAULT_SIGMAS
         else:
-            recent_logs = past_logs.head(20)
-            sigma_pts = recent_logs['PTS'].std() if not pd.isna(recent_logs['PTS'].std()) else 5.0
-            sigma_reb = recent_logs['REB'].std() if not pd.isna(recent_logs['REB'].std()) else 2.0
-            sigma_ast = recent_logs['AST'].std() if not pd.isna(recent_logs['AST'].std()) else 2.0
+            sigma_pts, sigma_reb, sigma_ast = np.where(np.isnan(l20_sigmas), DEFAULT_SIGMAS, l20_sigmas)
 
-        baseline = {
+        return {
             'baseline_pts_min': baseline_pts_min,
             'baseline_reb_min': baseline_reb_min,
             'baseline_ast_min': baseline_ast_min,
@@ -123,117 +184,130 @@ def get_player_baseline(player_id, game_date, is_home, opponent_id):
             'sigma_reb': sigma_reb,
             'sigma_ast': sigma_ast
         }
-        BASELINE_CACHE[cache_key] = baseline
-        return baseline
     except Exception:
         return None
 
+def batch_get_baselines(triples, game_date):
+    """Fetches baselines for (player_id, is_home, opponent_id) triples concurrently. Returns {player_id: baseline}."""
+    futures = {
+        player_id: BASELINE_EXECUTOR.submit(get_player_baseline, player_id, game_date, is_home, opponent_id)
+        for player_id, is_home, opponent_id in set(triples)
+    }
+    return {player_id: future.result() for player_id, future in futures.items()}
+
 def get_boxscore_snapshot(game_id, end_range):
     try:
+        API_LIMITER.wait()
         box = boxscoretraditionalv3.BoxScoreTraditionalV3(game_id=game_id, range_type="2", start_range="0", end_range=str(end_range))
-        return box.player_stats.get_data_frame()
+        return narrow_boxscore(box.player_stats.get_data_frame())
     except Exception:
         return pd.DataFrame()
 
-def parse_minutes(min_str):
-    try:
-        parts = min_str.split(':')
-        return int(parts[0]) + int(parts[1])/60
-    except:
-        return 0.0
-
 def analyze_game(game_info, game_date):
+    """Checks every significant player's Q3 floor against the final box. Returns the report lines."""
+    lines = []
     game_id = game_info['GAME_ID']
     home_team_id = game_info['HOME_TEAM_ID']
     visitor_team_id = game_info['VISITOR_TEAM_ID']
     
-    print(f"Analyzing Game {game_id}...")
+    lines.append(f"Analyzing Game {game_id}...")
     
+    # Only look at Q3 (End of Q3 is 21600 tenths of seconds = 36 mins).
+    # It is requested while the full box is in flight, so the game costs one round-trip of latency
+    q3_future = SNAPSHOT_EXECUTOR.submit(get_boxscore_snapshot, game_id, 21600)
+
     try:
+        API_LIMITER.wait()
         full_box = boxscoretraditionalv3.BoxScoreTraditionalV3(game_id=game_id)
-        full_df = full_box.player_stats.get_data_frame()
+        full_df = narrow_boxscore(full_box.player_stats.get_data_frame())
     except Exception:
-        return
+        return lines
 
-    if full_df.empty: return
-    full_df['min_float'] = full_df['minutes'].apply(parse_minutes)
+    if full_df.empty: return lines
+    full_df['min_float'] = parse_minutes_col(full_df['minutes'])
     significant_players = full_df[full_df['min_float'] > 20]
-    if significant_players.empty: return
-
-    # Only look at Q3 (End of Q3 is 21600 tenths of seconds = 36 mins)
-    q3_snapshot = get_boxscore_snapshot(game_id, 21600)
-    if q3_snapshot.empty: return
-
-    for _, player in significant_players.iterrows():
-        player_id = player['personId']
-        name = f"{player['firstName']} {player['familyName']}"
-        team_id = player['teamId']
-        is_home = (team_id == home_team_id)
-        opponent_id = visitor_team_id if is_home else home_team_id
-        
-        baseline = get_player_baseline(player_id, game_date, is_home, opponent_id)
-        if not baseline: continue
+    if significant_players.empty: return lines
 
-        final_stats = {'PTS': player['points'], 'REB': player['reboundsTotal'], 'AST': player['assists']}
-        final_min = player['min_float']
+    q3_snapshot = q3_future.result()
+    if q3_snapshot.empty: return lines
 
-        p_snap = q3_snapshot[q3_snapshot['personId'] == player_id]
-        if p_snap.empty:
-            cur_stats = {'PTS': 0, 'REB': 0, 'AST': 0}
-            cur_min = 0.0
-            cur_fouls = 0
-        else:
-            p_data = p_snap.iloc[0]
-            cur_stats = {'PTS': p_data['points'], 'REB': p_data['reboundsTotal'], 'AST': p_data['assists']}
-            cur_min = parse_minutes(p_data['minutes'])
-            cur_fouls = p_data['foulsPersonal']
-
-        team_scores = q3_snapshot.groupby('teamId')['points'].sum()
-        my_score = team_scores.get(team_id, 0)
-        opp_score = team_scores.get(opponent_id, 0)
-        score_diff = my_score - opp_score
-
-        # Calculate Prediction
-        if cur_min > 0:
-            cur_pace_pts = cur_stats['PTS'] / cur_min
-        else:
-            cur_pace_pts = 0
-            
-        perf_factor = PredictionEngine.calculate_performance_factor(cur_pace_pts, baseline['baseline_pts_min'])
-        
-        rm = PredictionEngine.calculate_dynamic_remaining_minutes(
-            baseline['avg_minutes'], cur_min, cur_fouls, score_diff, 3, perf_factor
-        )
+    # Fetch every player's baseline in one batch, so the rest of the game is pure CPU
+    is_home = significant_players['teamId'] == home_team_id
+    opponent_ids = np.where(is_home, visitor_team_id, home_team_id)
+    baselines_by_id = batch_get_baselines(zip(significant_players['personId'], is_home, opponent_ids), game_date)
+
+    players = significant_players[[bool(baselines_by_id.get(pid)) for pid in significant_players['personId']]]
+    if players.empty: return lines
+    baselines = pd.DataFrame([baselines_by_id[pid] for pid in players['personId']])
 
-        stat_types = [('PTS', 'baseline_pts_min', 'sigma_pts'), ('REB', 'baseline_reb_min', 'sigma_reb'), ('AST', 'baseline_ast_min', 'sigma_ast')]
+    stat_types = [('PTS', 'baseline_pts_min', 'sigma_pts'), ('REB', 'baseline_reb_min', 'sigma_reb'), ('AST', 'baseline_ast_min', 'sigma_ast')]
+    stat_cols = ['points', 'reboundsTotal', 'assists']
 
-        for stat_name, base_key, sigma_key in stat_types:
-            pfs = PredictionEngine.calculate_pfs(cur_stats[stat_name], baseline[base_key], rm, 3)
-            low, high, sigma = PredictionEngine.get_prediction_range(pfs, baseline[sigma_key], cur_min, baseline['avg_minutes'], cur_stats[stat_name])
+    # Q3 state of every player in one lookup; players missing from the snapshot have zero stats
+    snap = q3_snapshot.drop_duplicates('personId').set_index('personId')
+    counts = snap[stat_cols + ['foulsPersonal']].reindex(players['personId'], fill_value=0)
+    cur_stats = counts[stat_cols].to_numpy()
+    cur_fouls = counts['foulsPersonal'].to_numpy()
+    cur_min = parse_minutes_col(snap['minutes'].reindex(players['personId'])).to_numpy()
+
+    # One groupby per game; every player's score diff is then a pair of dict lookups
+    team_scores = q3_snapshot.groupby('teamId', sort=False)['points'].sum().to_dict()
+    team_ids = players['teamId'].to_numpy()
+    opponent_ids = np.where(team_ids == home_team_id, visitor_team_id, home_team_id)
+    score_diff = np.array([team_scores.get(t, 0) - team_scores.get(o, 0) for t, o in zip(team_ids, opponent_ids)])
+
+    # Calculate Prediction (every player and stat in one call)
+    pfs_all, low_all, high_all, perf_all, rm_all = PredictionEngine.predict_stats_vec(
+        cur_stats,
+        baselines[[base_key for _, base_key, _ in stat_types]].to_numpy(),
+        baselines[[sigma_key for _, _, sigma_key in stat_types]].to_numpy(),
+        cur_min, baselines['avg_minutes'].to_numpy(), cur_fouls, score_diff, 3
+    )
+
+    names = (players['firstName'].astype(str) + ' ' + players['familyName'].astype(str)).to_numpy()
+    final_stats_all = players[stat_cols].to_numpy()
+    final_mins = players['min_float'].to_numpy()
+    avg_mins = baselines['avg_minutes'].to_numpy()
+
+    for k, name in enumerate(names):
+        final_min, avg_min = final_mins[k], avg_mins[k]
+        perf_factor, rm = perf_all[k], rm_all[k]
+
+        for i, (stat_name, base_key, sigma_key) in enumerate(stat_types):
+            pfs, low = pfs_all[k, i], low_all[k, i]
+            final_stat, cur_stat = final_stats_all[k, i], cur_stats[k, i]
             
             # Check for Floor Failure (Actual < Floor)
-            if final_stats[stat_name] < low:
-                print(f"\n[FLOOR MISS] {name} - {stat_name} (Q3)")
-                print(f"  Floor: {low:.1f} | Actual: {final_stats[stat_name]} | PFS: {pfs:.1f}")
-                print(f"  Q3 Stats: {cur_stats[stat_name]} in {cur_min:.1f} min")
-                print(f"  Minutes: Avg={baseline['avg_minutes']:.1f} | Final={final_min:.1f} | Proj Rem={rm:.1f} | Act Rem={final_min - cur_min:.1f}")
-                print(f"  Context: Diff={score_diff} | Fouls={cur_fouls} | PerfFactor={perf_factor:.2f}")
-                print(f"  Pace: Base={baseline[base_key]:.2f} | Cur={cur_stats[stat_name]/cur_min if cur_min>0 else 0:.2f}")
+            if final_stat < low:
+                lines.append(f"\n[FLOOR MISS] {name} - {stat_name} (Q3)")
+                lines.append(f"  Floor: {low:.1f} | Actual: {final_stat} | PFS: {pfs:.1f}")
+                lines.append(f"  Q3 Stats: {cur_stat} in {cur_min[k]:.1f} min")
+                lines.append(f"  Minutes: Avg={avg_min:.1f} | Final={final_min:.1f} | Proj Rem={rm:.1f} | Act Rem={final_min - cur_min[k]:.1f}")
+                lines.append(f"  Context: Diff={score_diff[k]} | Fouls={cur_fouls[k]} | PerfFactor={perf_factor:.2f}")
+                lines.append(f"  Pace: Base={baselines[base_key].iat[k]:.2f} | Cur={cur_stat/cur_min[k] if cur_min[k]>0 else 0:.2f}")
                 
                 # Diagnosis
                 reasons = []
-                if (final_min - cur_min) < (rm - 2): reasons.append("Played less than projected")
-                if (final_min - cur_min) > (rm + 2): reasons.append("Played MORE than projected (Efficiency Drop?)")
-                if abs(score_diff) > 20: reasons.append("Blowout")
-                if cur_fouls >= 4: reasons.append("Foul Trouble")
+                if (final_min - cur_min[k]) < (rm - 2): reasons.append("Played less than projected")
+                if (final_min - cur_min[k]) > (rm + 2): reasons.append("Played MORE than projected (Efficiency Drop?)")
+                if abs(score_diff[k]) > 20: reasons.append("Blowout")
+                if cur_fouls[k] >= 4: reasons.append("Foul Trouble")
                 if perf_factor > 1.2: reasons.append("Hot Hand Regression")
                 
-                print(f"  Diagnosis: {', '.join(reasons)}")
+                lines.append(f"  Diagnosis: {', '.join(reasons)}")
             else:
-                print(f"[FLOOR HIT] {name} - {stat_name} (Q3) | Floor: {low:.1f} <= Actual: {final_stats[stat_name]}")
+                lines.append(f"[FLOOR HIT] {name} - {stat_name} (Q3) | Floor: {low:.1f} <= Actual: {final_stat}")
+
+    return lines
+
+def get_games_for_date(date_str):
+    API_LIMITER.wait()
+    board = scoreboardv2.ScoreboardV2(game_date=date_str)
+    games = board.game_header.get_data_frame()
+    if games.empty: return []
+    return games[['GAME_ID', 'HOME_TEAM_ID', 'VISITOR_TEAM_ID']].to_dict('records')
 
 def main():
-    fetch_team_defense()
     # Get games from yesterday or a specific date to test
     # Let's try to find a date with games. 
     # Since I don't know the exact date of the 9 games, I'll try the last few days.
@@ -241,18 +315,37 @@ def main():
     today = datetime.date.today()
     dates = [today - datetime.timedelta(days=i) for i in range(1, 4)]
     
-    for d in dates:
-        date_str = d.strftime('%Y-%m-%d')
-        print(f"\nChecking {date_str}...")
-        try:
-            board = scoreboardv2.ScoreboardV2(game_date=date_str)
-            games = board.game_header.get_data_frame()
-            if not games.empty:
-                game_list = games[['GAME_ID', 'HOME_TEAM_ID', 'VISITOR_TEAM_ID']].to_dict('records')
-                for game in game_list:
-                    analyze_game(game, date_str)
-        except Exception as e:
-            print(f"Error: {e}")
+    # Every game is queued up front and analyzed concurrently; reports still print in date/game order
+    with ThreadPoolExecutor(max_workers=GAME_WORKERS) as executor:
+        # Team stats, league player totals and every date's scoreboard are requested together;
+        # games only need to wait for the two league tables before they start
+        defense = executor.submit(fetch_team_defense)
+        totals = executor.submit(fetch_league_season_totals)
+        date_strs = [d.strftime('%Y-%m-%d') for d in dates]
+        boards = [(date_str, executor.submit(get_games_for_date, date_str)) for date_str in date_strs]
+        defense.result()
+        totals.result()
+
+        schedule = []
+        for date_str, board in boards:
+            try:
+                games = board.result()
+                schedule.append((date_str, [executor.submit(analyze_game, game, date_str) for game in games], None))
+            except Exception as e:
+                schedule.append((date_str, [], e))
+
+        # Each date's report is buffered and written with one call instead of a print per line
+        for date_str, futures, error in schedule:
+            buf = [f"\nChecking {date_str}..."]
+            if error is not None:
+                buf.append(f"Error: {error}")
+            for future in futures:
+                try:
+                    buf.extend(future.result())
+                except Exception as e:
+                    buf.append(f"Error: {e}")
+            sys.stdout.write("\n".join(buf) + "\n")
+            sys.stdout.flush()
 
 if __name__ == "__main__":
     main()
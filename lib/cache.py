@@ -0,0 +1,43 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+import lib.constants as constants
+
+NEVER_EXPIRE = None
+
+def _path_for(key):
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return os.path.join(constants.CACHE_DIR, f"{digest}.pkl")
+
+def _store(path, value):
+    """Writes atomically so a crash (or a concurrent reader) never sees a partial file."""
+    os.makedirs(constants.CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+def get_or_fetch(key, fetch_fn, ttl=NEVER_EXPIRE):
+    """
+    Returns the value cached on disk for `key`, or calls `fetch_fn()` and caches its result.
+
+    `ttl` is the maximum age in seconds before an entry is re-fetched; NEVER_EXPIRE
+    keeps it forever (e.g. box scores of completed games). Exceptions raised by
+    `fetch_fn` propagate and nothing is cached.
+    """
+    path = _path_for(key)
+    if os.path.exists(path) and (ttl is None or time.time() - os.path.getmtime(path) < ttl):
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            print(f"Error reading cache entry {key}: {e}")
+
+    value = fetch_fn()
+    try:
+        _store(path, value)
+    except Exception as e:
+        print(f"Error writing cache entry {key}: {e}")
+    return value
@@ -2,7 +2,13 @@ import os
 
 # --- File Paths ---
 DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
-BASELINES_FILE = os.path.join(DATA_DIR, 'baselines.json')
+BASELINES_FILE = os.path.join(DATA_DIR, 'baselines.json')  # Compact JSON, read by the pollers
+# Set PRETTY_BASELINES=1 to also write an indented copy for debugging
+BASELINES_PRETTY_FILE = os.path.join(DATA_DIR, 'baselines.pretty.json')
+WRITE_PRETTY_BASELINES = bool(os.environ.get('PRETTY_BASELINES'))
+CACHE_DIR = os.path.join(DATA_DIR, 'cache')  # On-disk NBA API response cache (lib/cache.py)
+ALERTS_DIR = os.path.join(DATA_DIR, 'alerts')  # Per-game sent-alert bitmaps (lib/poller.py)
+BACKTEST_RESULTS_FILE = os.path.join(DATA_DIR, 'backtest_results.csv')  # Per-game hit counts (aggregate_backtest.py)
 
 # --- API Configuration ---
 # Headers to mimic a browser to avoid some basic blocking, though nba_api handles most.
@@ -11,6 +17,8 @@ API_HEADERS = {
     'Accept-Language': 'en-US,en;q=0.5'
 }
 API_DELAY = 2.0  # Seconds to sleep between calls to avoid 429 errors
+# One season for the researcher and the backtests, so backtests can reuse the researcher's saved game logs
+SEASON = '2025-26'
 
 # --- Dynamic Alpha (Regression Factors) ---
 # Used to weight Current Pace vs. Baseline Pace based on game progress.
@@ -0,0 +1,31 @@
+import os
+import orjson
+from nba_api.library.http import NBAResponse
+
+def load_file(path):
+    """Reads and parses a JSON file with orjson."""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+def dump_file(path, obj, pretty=False):
+    """
+    Writes obj as JSON with orjson (compact unless pretty); NumPy scalars and arrays are serialized natively.
+    Writes to a temp file and renames it into place, so readers never see a half-written file.
+    """
+    option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if pretty else 0)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(obj, option=option))
+    os.replace(tmp_path, path)
+
+def _get_dict(self):
+    # nba_api parses each response twice (valid_json() and then the endpoint), so keep the result
+    parsed = getattr(self, '_parsed_dict', None)
+    if parsed is None:
+        parsed = orjson.loads(self._response)
+        self._parsed_dict = parsed
+    return parsed
+
+def install():
+    """Makes every nba_api response parse with orjson instead of the stdlib json module."""
+    NBAResponse.get_dict = _get_dict
@@ -0,0 +1,20 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from nba_api.stats.library.http import NBAStatsHTTP
+
+POOL_CONNECTIONS = 16  # Per-host connection pools kept
+POOL_MAXSIZE = 32  # Keep-alive connections per host; at least the number of threads making requests
+
+def make_session():
+    """A requests.Session with a pooled keep-alive adapter that retries throttled or flaky responses."""
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503])
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def install():
+    """Routes every stats.nba.com endpoint through one shared session."""
+    NBAStatsHTTP.set_session(make_session())
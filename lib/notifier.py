@@ -1,3 +1,29 @@
+# Alert layouts, filled with str.format_map so each alert is a single formatting pass
+_RULE = "--------------------------------------------------"
+
+_MESSAGE_TEMPLATE = (
+    "\n" + _RULE + "\n"
+    "🚨 **PREDICT: {prediction}** {stat_type} on **{player_name}**\n"
+    + _RULE + "\n"
+    "• **Current:** {current_val} {stat_type} in {minutes:.1f} min.\n"
+    "• **Projected Range:** [{low:.1f} to {high:.1f}] {stat_type}\n"
+    "• **Reasoning:** {reasoning}\n"
+    "{action_text}\n"
+    + _RULE + "\n"
+)
+
+_HIGH_TEMPLATE = (
+    "• **Betting Targets (OVER):**\n"
+    "  - **Floor (>95% Hit):** {low:.1f}\n"
+    "  - **25th %ile (~80% Hit):** {p25:.1f}{median}\n"
+    "• **Action:** Check live line. If line <= Target, consider OVER."
+)
+_MEDIAN_TEMPLATE = "\n  - **50th %ile (Median):** {p50:.1f}"
+
+# For UNDER, we'd look at High and 75th percentile, but we focused on OVERs in backtest.
+# Keeping simple logic for now.
+_UNDER_TEMPLATE = "• **Action:** Check live line. If line > {high:.1f}, consider UNDER."
+
 class Notifier:
     def __init__(self):
         pass
@@ -8,37 +34,28 @@ class Notifier:
         Currently prints to console.
         """
         low, high = projected_range
-        p25 = low + 0.25 * (high - low)
         
         # Determine Action advice based on prediction direction
         if prediction == "HIGH":
-            targets = (
-                f"  - **Floor (>95% Hit):** {low:.1f}\n"
-                f"  - **25th %ile (~80% Hit):** {p25:.1f}"
-            )
-            if p50 is not None:
-                targets += f"\n  - **50th %ile (Median):** {p50:.1f}"
-                
-            action_text = (
-                f"• **Betting Targets (OVER):**\n"
-                f"{targets}\n"
-                f"• **Action:** Check live line. If line <= Target, consider OVER."
-            )
+            median = _MEDIAN_TEMPLATE.format(p50=p50) if p50 is not None else ""
+            action_text = _HIGH_TEMPLATE.format(low=low, p25=low + 0.25 * (high - low), median=median)
         else:
-            # For UNDER, we'd look at High and 75th percentile, but we focused on OVERs in backtest.
-            # Keeping simple logic for now.
-            action_text = f"• **Action:** Check live line. If line > {high:.1f}, consider UNDER."
+            action_text = _UNDER_TEMPLATE.format(high=high)
 
-        message = (
-            f"\n--------------------------------------------------\n"
-            f"🚨 **PREDICT: {prediction}** {stat_type} on **{player_name}**\n"
-            f"--------------------------------------------------\n"
-            f"• **Current:** {current_val} {stat_type} in {minutes:.1f} min.\n"
-            f"• **Projected Range:** [{low:.1f} to {high:.1f}] {stat_type}\n"
-            f"• **Reasoning:** {reasoning}\n"
-            f"{action_text}\n"
-            f"--------------------------------------------------\n"
-        )
+        message = _MESSAGE_TEMPLATE.format_map({
+            'prediction': prediction,
+            'stat_type': stat_type,
+            'player_name': player_name,
+            'current_val': current_val,
+            'minutes': minutes,
+            'low': low,
+            'high': high,
+            'reasoning': reasoning,
+            'action_text': action_text,
+        })
         
         print(message)
         # In the future, add requests.post() here for Pushover/Telegram
+
+# Shared by every Poller
+NOTIFIER = Notifier()
@@ -1,228 +1,550 @@
 import time
-import json
-import threading
+import hashlib
+import itertools
+import logging
+import asyncio
+import functools
+import traceback
 import math
+import mmap
+import os
+import random
+import re
+from collections import deque, namedtuple
+from types import MappingProxyType
+from datetime import datetime, timezone
+import numpy as np
+import orjson
+import requests
 from nba_api.live.nba.endpoints import boxscore
+from nba_api.live.nba.library.http import NBALiveHTTP
 import lib.constants as constants
-from lib.notifier import Notifier
+import lib.fast_json as fast_json
+import lib.nba_session as nba_session
+from lib.notifier import NOTIFIER
 from lib.prediction_engine import PredictionEngine
 
-class Poller(threading.Thread):
-    def __init__(self, game_id, home_team_id, visitor_team_id):
-        super().__init__()
+log = logging.getLogger(__name__)
+
+LIVE_BOXSCORE_URL = NBALiveHTTP.base_url.format(endpoint=boxscore.BoxScore.endpoint_url)
+# The CDN answers 403/404 (with an XML error body) until a game's box score is published
+NOT_PUBLISHED_STATUSES = (403, 404)
+NOT_PUBLISHED = object()  # _fetch_boxscore result for a game whose box score isn't up yet
+
+# Live box score minutes are ISO-8601 durations like "PT10M00.00S"
+_MINUTES_RE = re.compile(r'PT(?:(\d+)M)?(?:([\d.]+)S)?')
+
+# Every game's pollers share the cache, and one game alone can show a few thousand distinct durations
+MINUTES_CACHE_SIZE = 4096
+
+@functools.lru_cache(maxsize=MINUTES_CACHE_SIZE)
+def _parse_minutes(minutes_str):
+    """Minutes played from a live box score duration; the same strings repeat across players and polls."""
+    # Players yet to check in report "" (or nothing): answer those without raising
+    match = _MINUTES_RE.match(minutes_str) if minutes_str else None
+    if match is None:
+        return 0.0
+    try:
+        return int(match[1] or 0) + float(match[2] or 0) / 60.0
+    except ValueError:  # Malformed seconds, e.g. "1.2.3"
+        return 0.0
+
+# Per stat: live box score field, baseline pace and sigma keys, floor on the HIGH threshold,
+# and the buffer it must be cleared by. Order matters: PredictionEngine.predict_stats_vec
+# expects (PTS, REB, AST).
+STAT_RULES = {
+    'PTS': ('points', 'baseline_pts_min', 'sigma_pts', 7, constants.BUFFER_PTS),
+    'REB': ('reboundsTotal', 'baseline_reb_min', 'sigma_reb', 3, constants.BUFFER_REB),
+    'AST': ('assists', 'baseline_ast_min', 'sigma_ast', 3, constants.BUFFER_AST),
+}
+STAT_FIELDS = [rule[0] for rule in STAT_RULES.values()]
+PACE_KEYS = [rule[1] for rule in STAT_RULES.values()]
+SIGMA_KEYS = [rule[2] for rule in STAT_RULES.values()]
+STAT_BUFFERS = np.array([rule[4] for rule in STAT_RULES.values()])
+# Reasoning flag thresholds, bound at import like the buffers above
+FOUL_TROUBLE_THRESHOLD = constants.FOUL_TROUBLE_THRESHOLD
+BLOWOUT_DIFF_THRESHOLD = constants.BLOWOUT_DIFF_THRESHOLD
+PERIOD_SLOTS = 16  # Alert bits reserved per (player, stat): Q1-Q4 plus overtimes
+# Alert bitmap files start with the fingerprint of the baselines table their bits index into
+ALERT_HEADER_SIZE = 8
+ALERT_BITMAP_MAX_AGE = 24 * 3600  # Older bitmaps belong to games whose poller never saw Final
+
+# One row per baseline player; the per-stat fields follow STAT_RULES order
+BASELINE_DTYPE = np.dtype([
+    ('pace', 'f8', (len(STAT_RULES),)),
+    ('sigma', 'f8', (len(STAT_RULES),)),
+    ('threshold_high', 'f8', (len(STAT_RULES),)),
+    # Trigger edges derived from threshold_high, see Poller._precompute_thresholds
+    ('debug_above', 'f8', (len(STAT_RULES),)),
+    ('high_above', 'f8', (len(STAT_RULES),)),
+    ('low_below', 'f8', (len(STAT_RULES),)),
+    ('avg_minutes', 'f8'),
+    ('low_min_minutes', 'f8'),
+    ('team_id', 'i4'),
+])
+MAX_ACTIVE_PLAYERS = 40  # Both teams' full rosters; see Poller._allocate_buffers
+HIGH_FLOORS = np.array([rule[3] for rule in STAT_RULES.values()], dtype=float)
+
+# Shared read-only baselines: integer player id -> row number, the BASELINE_DTYPE table, and a
+# fingerprint of the row order (ALERT_HEADER_SIZE bytes) so alert bitmaps can tell if it changed
+Baselines = namedtuple('Baselines', ['id_to_idx', 'table', 'fingerprint'])
+
+# Poll schedule (seconds). Early in a quarter projections barely move; a close fourth
+# quarter is when alerts matter most. Unchanged box scores stretch the interval up to the cap.
+POLL_INTERVAL = 30
+EARLY_QUARTER_INTERVAL = 45
+CLUTCH_INTERVAL = 15
+MAX_INTERVAL = 60
+UNCHANGED_BACKOFF = 1.5
+PRE_GAME_LEAD = 30  # Wake this long before tip-off
+MAX_PRE_GAME_SLEEP = 600  # Keep pre-game sleeps short enough to notice running=False
+
+START_JITTER = 30  # Max seconds a new poller waits before its first poll, so games don't poll in lockstep
+# After consecutive failed polls, wait POLL_INTERVAL * 2**failures (capped) plus up to ERROR_JITTER
+# seconds, so a struggling API isn't hit by every game's retries at the same moment
+MAX_ERROR_BACKOFF = 300
+ERROR_JITTER = 5
+MAX_CONCURRENT_POLLS = 8  # Polls in flight at once across all games
+POLL_TIMING_WINDOW = 120  # Recent polls kept for the p50/p99 poll time log
+POLL_TIMING_EVERY = 20  # Log poll times every this many polls
+
+_shared_baselines = (None, None)  # (baselines file mtime, Baselines), see shared_baselines
+
+def shared_baselines():
+    """
+    The one read-only Baselines every poller in the process shares. Loaded on first use
+    and again only after the researcher rewrites the file.
+    """
+    global _shared_baselines
+    try:
+        mtime = os.stat(constants.BASELINES_FILE).st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
+    loaded_mtime, baselines = _shared_baselines
+    if baselines is None or mtime != loaded_mtime:
+        baselines = Poller.load_baselines()
+        _shared_baselines = (mtime, baselines)
+    return baselines
+
+class Poller:
+    # Every game's poll loop runs as a task on one asyncio event loop (see main.py); the
+    # blocking fetch is handed to the loop's default executor instead of owning a thread.
+    # One keep-alive session (pooled, with retries) is shared by every game, so
+    # each poll reuses an open TLS connection to the CDN instead of handshaking again
+    _session = nba_session.make_session()
+    _session.headers.update(NBALiveHTTP.headers)
+    # Bounds how many games' polls run in the executor at once
+    _poll_slots = asyncio.Semaphore(MAX_CONCURRENT_POLLS)
+
+    def __init__(self, game_id, home_team_id, visitor_team_id, baselines=None, notifier=None, session=None):
         self.game_id = game_id
         self.home_team_id = home_team_id
         self.visitor_team_id = visitor_team_id
         self.running = True
-        self.baselines = self._load_baselines()
-        self.notifier = Notifier()
-        self.alerted_players = set()  # Track alerted players to avoid spam
+        # Baselines are read-only once loaded, so every game's poller can share one copy
+        self.baselines = baselines if baselines is not None else self.load_baselines()
+        self.notifier = notifier or NOTIFIER
+        if session is not None:
+            self._session = session
+        # Track alerted players to avoid spam: one bit per (player, stat, period), see _alert_bit.
+        # File-backed, so a restart mid-game doesn't resend alerts
+        self.alerted_players = self._open_alert_bitmap(len(self.baselines.table) * len(STAT_RULES) * PERIOD_SLOTS // 8)
+        # Identity of the last box score we processed, to skip polls where nothing changed
+        self._etag = None
+        self._last_digest = None
+        self._last_game_state = None  # (period, clock, home score, away score) last projected
+        self.poll_interval = POLL_INTERVAL
+        self.next_poll_at = 0.0  # Epoch seconds of the next poll; set by each poll()
+        self.poll_count = 0
+        self._err_count = 0  # Consecutive failed polls, see _error_backoff
+        self._allocate_buffers(MAX_ACTIVE_PLAYERS)
+        self.poll_times = deque(maxlen=POLL_TIMING_WINDOW)
 
-    def _load_baselines(self):
+    @classmethod
+    def load_baselines(cls):
+        """Loads the baselines file once into a read-only table to share across pollers."""
+        players = cls._read_baselines_file()
+        # Rows in player id order, so rebuilding the file for the same players keeps every row in place
+        player_ids = sorted(int(player_id) for player_id in players)
+        table = np.zeros(len(players), dtype=BASELINE_DTYPE)
+        for index, player_id in enumerate(player_ids):
+            entry = players[str(player_id)]
+            stats = entry["stats"]
+            table[index]['pace'] = [stats[key] for key in PACE_KEYS]
+            table[index]['sigma'] = [stats[key] for key in SIGMA_KEYS]
+            table[index]['avg_minutes'] = stats["avg_minutes"]
+            table[index]['team_id'] = entry["team_id"]
+        cls._precompute_thresholds(table)
+        table.flags.writeable = False
+        # Keyed by int, like the live box score's personId, so polls needn't str() every id
+        id_to_idx = {player_id: index for index, player_id in enumerate(player_ids)}
+        fingerprint = hashlib.blake2b(np.array(player_ids, dtype=np.int64).tobytes(), digest_size=ALERT_HEADER_SIZE).digest()
+        return Baselines(MappingProxyType(id_to_idx), table, fingerprint)
+
+    @staticmethod
+    def _read_baselines_file():
         try:
-            with open(constants.BASELINES_FILE, "r") as f:
-                data = json.load(f)
-                # Handle new format with metadata
-                if "_meta" in data and "players" in data:
-                    return data["players"]
-                return data
+            data = fast_json.load_file(constants.BASELINES_FILE)
+            # Handle new format with metadata
+            if "_meta" in data and "players" in data:
+                return data["players"]
+            return data
         except FileNotFoundError:
             print("Baselines file not found. Run researcher first.")
             return {}
 
-    def run(self):
+    @staticmethod
+    def _precompute_thresholds(table):
+        """Derives each player's thresholds and trigger edges once; they only depend on the baseline."""
+        # High Threshold: 80% of Season Avg (Alert if we are sure to beat this)
+        table['threshold_high'] = np.maximum(table['pace'] * table['avg_minutes'][:, None] * 0.8, HIGH_FLOORS)
+        # Debug log once the floor passes half the threshold
+        table['debug_above'] = table['threshold_high'] * 0.5
+        # HIGH / LOW alerts need the whole range to clear the threshold by the stat's buffer
+        table['high_above'] = table['threshold_high'] + STAT_BUFFERS
+        table['low_below'] = table['threshold_high'] - STAT_BUFFERS
+        # Only alert LOW once a player has played 40% of their usual minutes
+        table['low_min_minutes'] = table['avg_minutes'] * 0.4
+
+    def _open_alert_bitmap(self, size):
+        """
+        Maps this game's alert bitmap file into memory, creating it zero-filled on first run.
+        A file written against a different baselines table (other fingerprint) starts over.
+        """
+        if size == 0:  # No baselines, nothing to alert on (and mmap can't map zero bytes)
+            return bytearray()
+        os.makedirs(constants.ALERTS_DIR, exist_ok=True)
+        self._prune_alert_bitmaps()
+        self._alerts_path = os.path.join(constants.ALERTS_DIR, f".alerts_{self.game_id}.bitmap")
+        fingerprint = self.baselines.fingerprint
+        fd = os.open(self._alerts_path, os.O_RDWR | os.O_CREAT)
+        try:
+            if os.fstat(fd).st_size != ALERT_HEADER_SIZE + size or os.pread(fd, ALERT_HEADER_SIZE, 0) != fingerprint:
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, ALERT_HEADER_SIZE + size)
+                os.pwrite(fd, fingerprint, 0)
+            self._alerts_map = mmap.mmap(fd, ALERT_HEADER_SIZE + size)
+        finally:
+            os.close(fd)  # The mapping keeps its own handle
+        return memoryview(self._alerts_map)[ALERT_HEADER_SIZE:]
+
+    @staticmethod
+    def _prune_alert_bitmaps():
+        """Deletes bitmaps left behind by games that were never polled through to Final."""
+        cutoff = time.time() - ALERT_BITMAP_MAX_AGE
+        for entry in os.scandir(constants.ALERTS_DIR):
+            if entry.name.startswith(".alerts_") and entry.name.endswith(".bitmap"):
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                except FileNotFoundError:  # Another poller pruned it first
+                    pass
+
+    def _discard_alert_bitmap(self):
+        """Deletes the alert bitmap file once the game is over."""
+        if isinstance(self.alerted_players, memoryview):
+            self.alerted_players.release()
+            self._alerts_map.close()
+            self.alerted_players = bytearray()
+            os.remove(self._alerts_path)
+
+    def _allocate_buffers(self, rows):
+        """Per-poll input arrays, allocated once and refilled in place by every poll."""
+        self._buffers = {
+            "index": np.empty(rows, dtype=np.intp),
+            "minutes": np.empty(rows),
+            "current": np.empty((rows, len(STAT_RULES))),
+            "fouls": np.empty(rows, dtype=np.int64),
+            "team_ids": np.empty(rows, dtype=np.int64),
+            "rows": np.empty(rows, dtype=BASELINE_DTYPE),
+        }
+
+    @staticmethod
+    def _alert_bit(player_index, stat_index, period):
+        """Bit position in alerted_players for one (player, stat, period) alert."""
+        return (player_index * len(STAT_RULES) + stat_index) * PERIOD_SLOTS + min(period, PERIOD_SLOTS - 1)
+
+    async def run(self):
         print(f"Starting Poller for Game {self.game_id}...")
+        await asyncio.sleep(random.uniform(0, START_JITTER))
         while self.running:
+            self.poll_count += 1
+            started = time.perf_counter()
             try:
-                self.poll()
-                time.sleep(30)  # Poll every 30 seconds
-            except Exception as e:
-                print(f"Error in Poller {self.game_id}", e)
-                time.sleep(30)
+                async with self._poll_slots:
+                    await asyncio.to_thread(self.poll)
+            except Exception:
+                # A bug, not a network hiccup: keep polling, but keep the traceback
+                print(f"Error in Poller {self.game_id} (poll #{self.poll_count}):\n{traceback.format_exc()}")
+                self._schedule_next(self._error_backoff())
+            self._record_poll_time(time.perf_counter() - started)
+            await asyncio.sleep(max(self.next_poll_at - time.time(), 0))
+
+    def _record_poll_time(self, seconds):
+        """Keeps a rolling window of poll durations and periodically logs its p50/p99."""
+        self.poll_times.append(seconds)
+        if self.poll_count % POLL_TIMING_EVERY == 0:
+            p50, p99 = np.percentile(self.poll_times, [50, 99]) * 1000
+            print(f"[Game {self.game_id}] Poll time over last {len(self.poll_times)}: p50={p50:.1f}ms p99={p99:.1f}ms")
+
+    def _error_backoff(self):
+        """Counts a failed poll and returns the exponential, jittered wait before the next one."""
+        self._err_count += 1
+        return min(MAX_ERROR_BACKOFF, POLL_INTERVAL * (1 << min(self._err_count, 4))) + random.uniform(0, ERROR_JITTER)
+
+    def _schedule_next(self, interval):
+        """Sets when run() should poll next."""
+        self.poll_interval = interval
+        self.next_poll_at = time.time() + interval
+
+    @staticmethod
+    def _live_interval(period, clock, score_diff):
+        """Poll interval for a live game from the period, the game clock and the margin."""
+        if period >= 4 and score_diff < 8:
+            return CLUTCH_INTERVAL
+
+        match = _MINUTES_RE.match(clock or "")
+        if match and match[0]:
+            minutes_left = int(match[1] or 0) + float(match[2] or 0) / 60.0
+            if minutes_left > 6:  # Fewer than 6 minutes played in the quarter
+                return EARLY_QUARTER_INTERVAL
+        return POLL_INTERVAL
+
+    @staticmethod
+    def _pre_game_interval(game_time_utc):
+        """Sleeps until just before tip-off, in bounded steps."""
+        try:
+            start = datetime.strptime(game_time_utc, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+        except (TypeError, ValueError):
+            return POLL_INTERVAL
+        until_start = start.timestamp() - PRE_GAME_LEAD - time.time()
+        return min(max(until_start, POLL_INTERVAL), MAX_PRE_GAME_SLEEP)
+
+    def _fetch_boxscore(self):
+        """
+        Fetches the live box score with a conditional GET on the shared session.
+        Returns (data, etag, digest): the parsed JSON, None if it is unchanged since the last
+        processed poll (a 304 for our ETag, or byte-identical content), or NOT_PUBLISHED before
+        the game starts. poll() records etag and digest only once the payload has been processed.
+        """
+        headers = {"If-None-Match": self._etag} if self._etag else None
+        # Set a timeout to prevent hanging
+        response = self._session.get(
+            LIVE_BOXSCORE_URL.format(game_id=self.game_id), headers=headers, timeout=10
+        )
+        if response.status_code == 304:
+            return None, None, None
+        if response.status_code in NOT_PUBLISHED_STATUSES:
+            return NOT_PUBLISHED, None, None
+
+        digest = hashlib.blake2b(response.content, digest_size=8).digest()
+        if digest == self._last_digest:
+            return None, None, None
+
+        return orjson.loads(response.content), response.headers.get("ETag"), digest
 
     def poll(self):
         # Fetch live box score
         # Note: Using the live endpoint which is faster and lighter than stats endpoint
+        # Only fetch/decode failures are expected here; anything else propagates to run()
         try:
-            # Set a timeout to prevent hanging
-            box = boxscore.BoxScore(game_id=self.game_id, timeout=10)
-            data = box.get_dict()
-        except Exception as e:
-            # If the game hasn't started, the API returns XML (403/404) which fails JSON parsing.
-            # This is normal behavior for pre-game.
-            # However, we should log if it's a timeout or other error to help debugging.
-            if "timeout" in str(e).lower():
+            data, etag, digest = self._fetch_boxscore()
+        except (orjson.JSONDecodeError, requests.RequestException) as e:
+            # Pre-game responses are caught by status code, so a body that won't parse is a real error
+            if isinstance(e, requests.Timeout):
                 print(f"Game {self.game_id} poll timed out.")
-            elif "Expecting value" in str(e): # JSONDecodeError
-                print(f"Game {self.game_id} not active yet (JSON error).")
             else:
                 print(f"Game {self.game_id} poll failed: {e}")
+            self._schedule_next(self._error_backoff())
             return
 
-        game_status = data["game"]["gameStatus"]  # 1=Not Started, 2=Live, 3=Final
+        self._err_count = 0
+
+        if data is NOT_PUBLISHED:
+            # Normal before tip-off: the box score appears once the game is about to start
+            print(f"Game {self.game_id} not active yet.")
+            self._schedule_next(POLL_INTERVAL)
+            return
+
+        if data is None:
+            # Nothing changed since the last poll, so neither can any projection
+            self._schedule_next(min(self.poll_interval * UNCHANGED_BACKOFF, MAX_INTERVAL))
+            return
+
+        self._process_boxscore(data)
+        # Only a processed payload counts as seen; if processing raised, the next poll retries it
+        self._etag = etag
+        self._last_digest = digest
+
+    def _process_boxscore(self, data):
+        """Acts on a new box score: stops at Final, waits out pre-game, else projects every player."""
+        game = data["game"]
+        game_status = game["gameStatus"]  # 1=Not Started, 2=Live, 3=Final
 
         if game_status == 3:
             print(f"Game {self.game_id} is Final. Stopping Poller.")
             self.running = False
+            self._discard_alert_bitmap()
             return
 
         if game_status != 2:
             print(f"Game {self.game_id} not live yet.")
+            self._schedule_next(self._pre_game_interval(game.get("gameTimeUTC")))
             return
 
         # Game Flow Data
-        period = data["game"]["period"]
-        clock = data["game"][
+        period = game["period"]
+        clock = game[
             "gameClock"
         ]  # String "PT10M00.00S" or similar, need to parse if precise, but period is enough for Alpha
 
-        print(f"[Game {self.game_id}] Live - Q{period} {clock} - Scanning players...")
+        home_score = game["homeTeam"]["score"]
+        away_score = game["awayTeam"]["score"]
+
+        # Clock stopped and no scoring (timeout, review, halftime): nothing worth re-projecting yet.
+        # The next poll where the clock moves picks up whatever changed in between.
+        game_state = (period, clock, home_score, away_score)
+        if game_state == self._last_game_state:
+            self._schedule_next(min(self.poll_interval * UNCHANGED_BACKOFF, MAX_INTERVAL))
+            return
 
-        home_score = data["game"]["homeTeam"]["score"]
-        away_score = data["game"]["awayTeam"]["score"]
+        print(f"[Game {self.game_id}] Live - Q{period} {clock} - Scanning players...")
         score_diff = abs(home_score - away_score)
         winning_team_id = (
             self.home_team_id if home_score > away_score else self.visitor_team_id
         )
+        self._schedule_next(self._live_interval(period, clock, score_diff))
 
-        # Process Players
-        all_players = (
-            data["game"]["homeTeam"]["players"] + data["game"]["awayTeam"]["players"]
+        # Process Players, each tagged with the team they are playing for
+        all_players = itertools.chain(
+            zip(game["homeTeam"]["players"], itertools.repeat(self.home_team_id)),
+            zip(game["awayTeam"]["players"], itertools.repeat(self.visitor_team_id)),
         )
 
-        for player in all_players:
-            self.process_player(player, period, score_diff, winning_team_id)
+        active = []
+        for player, team_id in all_players:
+            row = self._parse_player(player, team_id)
+            if row:
+                active.append(row)
 
-    def process_player(self, player_data, period, score_diff, winning_team_id):
-        player_id = str(player_data["personId"])
-        name = player_data["name"]
-
-        if player_id not in self.baselines:
-            return
+        if active:
+            self.process_players(active, period, score_diff, winning_team_id)
+        # Recorded only once projected, so a failed projection is retried at the same game state
+        self._last_game_state = game_state
 
-        baseline = self.baselines[player_id]["stats"]
+    def _parse_player(self, player_data, team_id):
+        """Returns the live state of a player we have a baseline for, or None if they should be skipped."""
+        index = self.baselines.id_to_idx.get(player_data["personId"])
+        if index is None:
+            return None
 
         # Parse Current Stats
         stats = player_data["statistics"]
-        minutes_str = stats["minutes"]
-
-        try:
-            time_str = minutes_str.replace('PT', '')
-            minutes = 0
-            seconds = 0
-            
-            if 'M' in time_str:
-                parts = time_str.split('M')
-                minutes = int(parts[0])
-                time_str = parts[1]
-                
-            if 'S' in time_str:
-                seconds = float(time_str.replace('S', ''))
-                
-            minutes_played = minutes + (seconds / 60.0)
-        except:
-            minutes_played = 0.0
+        minutes_played = _parse_minutes(stats["minutes"])
 
         if minutes_played < 1:
-            return
+            return None
+
+        return {
+            "index": index,  # Row in the baselines table, also the alerted_players player number
+            "name": player_data["name"],
+            "team_id": team_id,
+            "minutes": minutes_played,
+            "current": [stats[field] for field in STAT_FIELDS],  # STAT_RULES order
+            "fouls": stats["foulsPersonal"],
+        }
 
-        current_pts = stats["points"]
-        current_reb = stats["reboundsTotal"]
-        current_ast = stats["assists"]
-        current_fouls = stats["foulsPersonal"]
-        avg_minutes = baseline["avg_minutes"]
+    def process_players(self, active, period, score_diff, winning_team_id):
+        """Projects every active player in one vectorized pass, then checks each stat's triggers."""
+        n = len(active)
+        if n > len(self._buffers["index"]):  # More players than any roster seen so far
+            self._allocate_buffers(n)
+        index, minutes_played, current, current_fouls, team_ids, rows = (
+            self._buffers[key][:n] for key in ("index", "minutes", "current", "fouls", "team_ids", "rows")
+        )
+        index[:] = [player["index"] for player in active]
+        minutes_played[:] = [player["minutes"] for player in active]
+        current[:] = [player["current"] for player in active]
+        current_fouls[:] = [player["fouls"] for player in active]
+        team_ids[:] = [player["team_id"] for player in active]
+        np.take(self.baselines.table, index, out=rows)
+        avg_minutes = rows['avg_minutes']
+
+        # --- 1-3. Performance Factor (Hot Hand, from PTS pace), Expected Remaining Minutes,
+        #          PFS (Projected Final Stat) and its range, for every player and stat at once ---
+        pfs, low, high, perf_factor, _ = PredictionEngine.predict_stats_vec(
+            current, rows['pace'], rows['sigma'], minutes_played, avg_minutes, current_fouls, score_diff, period
+        )
 
-        # --- 1. Calculate Performance Factor (Hot Hand) ---
-        # Use PTS pace as the primary driver for minutes adjustment
-        current_pace_pts = current_pts / minutes_played
-        perf_factor = PredictionEngine.calculate_performance_factor(current_pace_pts, baseline["baseline_pts_min"])
+        # --- 4. Reasoning Flags, one mask over all players per flag ---
+        # Game-wide conditions are the same for every player this tick
+        foul_period = period == 2 or period == 3
+        blowout = score_diff > BLOWOUT_DIFF_THRESHOLD and period >= 3
+        flag_masks = (
+            ("Foul Trouble", (current_fouls >= FOUL_TROUBLE_THRESHOLD) & foul_period),
+            ("Blowout Risk", (team_ids == winning_team_id) & blowout),
+            ("Hot Hand", perf_factor > 1.2),
+        )
 
-        # --- 2. Calculate Expected Remaining Minutes ---
-        rm = PredictionEngine.calculate_dynamic_remaining_minutes(
-            avg_minutes, minutes_played, current_fouls, score_diff, period, perf_factor
+        # --- 5. Check Triggers ---
+        self._check_triggers(
+            active, period, flag_masks, pfs, low, high, perf_factor, rows, minutes_played
         )
 
-        # Reasoning Flags
-        reasoning_flags = []
-        if current_fouls >= constants.FOUL_TROUBLE_THRESHOLD and period in [2, 3]:
-            reasoning_flags.append("Foul Trouble")
-        
-        team_id = self.baselines[player_id]["team_id"]
-        if (score_diff > constants.BLOWOUT_DIFF_THRESHOLD and period >= 3 and team_id == winning_team_id):
-            reasoning_flags.append("Blowout Risk")
-            
-        if perf_factor > 1.2:
-            reasoning_flags.append("Hot Hand")
-
-        # --- 3. Calculate PFS (Projected Final Stat) ---
-        pfs_pts = PredictionEngine.calculate_pfs(current_pts, baseline["baseline_pts_min"], rm, period)
-        pfs_reb = PredictionEngine.calculate_pfs(current_reb, baseline["baseline_reb_min"], rm, period)
-        pfs_ast = PredictionEngine.calculate_pfs(current_ast, baseline["baseline_ast_min"], rm, period)
-
-        # --- 4. Check Triggers ---
-        self._check_trigger(player_id, name, "PTS", pfs_pts, baseline["sigma_pts"], current_pts, minutes_played, period, reasoning_flags, perf_factor, baseline["baseline_pts_min"] * avg_minutes, avg_minutes)
-        self._check_trigger(player_id, name, "REB", pfs_reb, baseline["sigma_reb"], current_reb, minutes_played, period, reasoning_flags, perf_factor, baseline["baseline_reb_min"] * avg_minutes, avg_minutes)
-        self._check_trigger(player_id, name, "AST", pfs_ast, baseline["sigma_ast"], current_ast, minutes_played, period, reasoning_flags, perf_factor, baseline["baseline_ast_min"] * avg_minutes, avg_minutes)
-
-
-    def _check_trigger(
+    def _check_triggers(
         self,
-        player_id,
-        name,
-        stat_type,
-        pfs,
-        sigma,
-        current_val,
-        minutes,
+        active,
         period,
-        flags,
+        flag_masks,
+        pfs,
+        low,
+        high,
         perf_factor,
-        season_avg,
-        player_avg_minutes
+        rows,
+        minutes_played
     ):
-        # Calculate Range using Engine
-        low, high, adjusted_sigma = PredictionEngine.get_prediction_range(
-            pfs, sigma, minutes, player_avg_minutes, current_val
-        )
-        
-        # Dynamic Thresholds
-        # High Threshold: 80% of Season Avg (Alert if we are sure to beat this)
-        threshold_high = season_avg * 0.8
-        
-        if stat_type == 'PTS':
-            threshold_high = max(threshold_high, 7)
-            buffer = constants.BUFFER_PTS
-        elif stat_type == 'REB':
-            threshold_high = max(threshold_high, 3)
-            buffer = constants.BUFFER_REB
-        elif stat_type == 'AST':
-            threshold_high = max(threshold_high, 3)
-            buffer = constants.BUFFER_AST
-        else:
-            buffer = 0
-
-        alert_key = f"{player_id}_{stat_type}_{period}"
-
-        # Debug Log
-        if low > (threshold_high * 0.5):
-            p50 = low + 0.50 * (high - low)
-            print(f"[DEBUG] {name} {stat_type}: Cur={current_val} PFS={pfs:.1f} Range=[{low:.1f}-{high:.1f}] P50={p50:.1f} Perf={perf_factor:.2f}")
-
-        if alert_key in self.alerted_players:
-            return
-
+        """
+        Compares every (player, stat) projection with its thresholds in one pass, then logs
+        and alerts on just the hits. Rows follow `active`, columns follow STAT_RULES.
+        """
+        # Dynamic Thresholds (precomputed per player, see _precompute_thresholds)
         # HIGH Alert (Entire range is ABOVE threshold)
-        if low > (threshold_high + buffer):
-            reasoning = f"Q{period} Perf={perf_factor:.2f}. " + ", ".join(flags)
-            p50 = low + 0.50 * (high - low)
-            self.notifier.send_alert(name, stat_type, "HIGH", current_val, minutes, (low, high), reasoning, p50)
-            self.alerted_players.add(alert_key)
-            
+        high_alert = low > rows['high_above']
         # LOW Alert (Entire range is BELOW threshold)
-        elif high < (threshold_high - buffer):
-             # Only alert LOW if significant minutes played to avoid early game noise
-            if minutes > (player_avg_minutes * 0.4):
-                reasoning = f"Q{period} Perf={perf_factor:.2f}. " + ", ".join(flags)
-                p50 = low + 0.50 * (high - low)
-                self.notifier.send_alert(name, stat_type, "LOW", current_val, minutes, (low, high), reasoning, p50)
-                self.alerted_players.add(alert_key)
+        # Only alert LOW if significant minutes played to avoid early game noise
+        low_alert = ~high_alert & (high < rows['low_below']) & (minutes_played > rows['low_min_minutes'])[:, None]
+        p50 = low + 0.50 * (high - low)
+
+        hits = high_alert | low_alert
+        # Near-miss projections are only worth finding when someone will read the debug log
+        debug_enabled = log.isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            debug = low > rows['debug_above']
+            hits |= debug
+
+        stat_types = list(STAT_RULES)
+        for i, j in np.argwhere(hits).tolist():
+            player = active[i]
+            name, stat_type, current_val = player["name"], stat_types[j], player["current"][j]
+
+            # Debug Log
+            if debug_enabled and debug[i, j]:
+                log.debug(
+                    "%s %s: Cur=%s PFS=%.1f Range=[%.1f-%.1f] P50=%.1f Perf=%.2f",
+                    name, stat_type, current_val, pfs[i, j], low[i, j], high[i, j], p50[i, j], perf_factor[i]
+                )
+
+            if not (high_alert[i, j] or low_alert[i, j]):
+                continue
+
+            alert_bit = self._alert_bit(player["index"], j, period)
+            alert_byte, alert_mask = alert_bit >> 3, 1 << (alert_bit & 7)
+            if self.alerted_players[alert_byte] & alert_mask:
+                continue
+
+            reasoning = f"Q{period} Perf={perf_factor[i]:.2f}. " + ", ".join(flag for flag, mask in flag_masks if mask[i])
+            prediction = "HIGH" if high_alert[i, j] else "LOW"
+            self.notifier.send_alert(
+                name, stat_type, prediction, current_val, player["minutes"], (low[i, j], high[i, j]), reasoning, p50[i, j]
+            )
+            self.alerted_players[alert_byte] |= alert_mask
@@ -1,7 +1,54 @@
+import functools
 import math
+import numpy as np
 import lib.constants as constants
 
+def _foul_blowout_modifier(period, current_fouls, score_diff):
+    """Minutes multiplier for foul trouble and blowouts; only used to fill _MOD_TABLE."""
+    modifier = 1.0
+
+    # --- Foul Trouble Adjustments ---
+    # Q1 (Period 1): 2+ Fouls is trouble
+    if period == 1 and current_fouls >= 2:
+        modifier *= 0.85
+    # Q2 (Period 2): 3+ Fouls is trouble
+    elif period == 2 and current_fouls >= 3:
+        modifier *= 0.80
+    # Q3 (Period 3): 4+ Fouls is trouble
+    elif period == 3 and current_fouls >= 4:
+        modifier *= 0.75
+    # Any time: 5 Fouls is critical
+    if current_fouls >= 5:
+        modifier *= 0.50
+
+    # --- Blowout Adjustments ---
+    # If score diff is massive, starters sit.
+    # Q3: Diff > 20
+    if period == 3 and abs(score_diff) > 20:
+        modifier *= 0.85
+    # Q4 (or late Q3 context): Diff > 25
+    if period >= 3 and abs(score_diff) > 25:
+        modifier *= 0.70
+
+    return modifier
+
+# The modifier only takes a handful of values, so it is tabulated once at import:
+# _MOD_TABLE[min(period, 4), min(fouls, 7), blowout bucket], buckets being |diff| <= 20, <= 25, > 25
+_MAX_PERIOD = 4
+_MAX_FOULS = 7
+_BLOWOUT_EDGES = np.array([20, 25])
+_MOD_TABLE = np.array([
+    [[_foul_blowout_modifier(period, fouls, diff) for diff in (0, 21, 26)] for fouls in range(_MAX_FOULS + 1)]
+    for period in range(_MAX_PERIOD + 1)
+])
+
+def _blowout_bucket(abs_diff):
+    """Column of _MOD_TABLE for an absolute score difference."""
+    return 0 if abs_diff <= 20 else 1 if abs_diff <= 25 else 2
+
 class PredictionEngine:
+    # The scalar methods are pure functions of hashable scalars, so the heavier ones
+    # memoize repeated inputs. Batch callers should use the *_vec variants below.
     @staticmethod
     def calculate_performance_factor(current_pace, baseline_pace):
         """
@@ -13,6 +60,7 @@ class PredictionEngine:
         return current_pace / baseline_pace
 
     @staticmethod
+    @functools.lru_cache(maxsize=4096)
     def calculate_dynamic_remaining_minutes(avg_minutes, current_minutes, current_fouls, score_diff, period, performance_factor=1.0):
         """
         Calculates expected remaining minutes.
@@ -25,30 +73,8 @@ class PredictionEngine:
         if base_remaining == 0:
             return 0
 
-        modifier = 1.0
-
-        # --- Foul Trouble Adjustments ---
-        # Q1 (Period 1): 2+ Fouls is trouble
-        if period == 1 and current_fouls >= 2:
-            modifier *= 0.85
-        # Q2 (Period 2): 3+ Fouls is trouble
-        elif period == 2 and current_fouls >= 3:
-            modifier *= 0.80
-        # Q3 (Period 3): 4+ Fouls is trouble
-        elif period == 3 and current_fouls >= 4:
-            modifier *= 0.75
-        # Any time: 5 Fouls is critical
-        if current_fouls >= 5:
-            modifier *= 0.50
-
-        # --- Blowout Adjustments ---
-        # If score diff is massive, starters sit.
-        # Q3: Diff > 20
-        if period == 3 and abs(score_diff) > 20:
-            modifier *= 0.85
-        # Q4 (or late Q3 context): Diff > 25
-        if period >= 3 and abs(score_diff) > 25:
-            modifier *= 0.70
+        # --- Foul Trouble and Blowout Adjustments (see _foul_blowout_modifier) ---
+        modifier = float(_MOD_TABLE[min(period, _MAX_PERIOD), int(min(current_fouls, _MAX_FOULS)), _blowout_bucket(abs(score_diff))])
 
         # --- Hot Hand Adjustment (New) ---
         # If playing well, coach plays them more.
@@ -91,6 +117,7 @@ class PredictionEngine:
         return current_stat + future_production
 
     @staticmethod
+    @functools.lru_cache(maxsize=4096)
     def get_prediction_range(pfs, sigma, minutes_played, avg_minutes, current_stat=0):
         """
         Calculates the asymmetric confidence interval.
@@ -122,3 +149,105 @@ class PredictionEngine:
         high = max(high, low)
 
         return low, high, adjusted_sigma
+
+
+    # --- Vectorized variants ---
+    # Same formulas as above, evaluated over NumPy arrays (one element per player)
+    # so backtests can score a whole snapshot at once. `period` is a scalar.
+
+    @staticmethod
+    def calculate_performance_factor_vec(current_pace, baseline_pace):
+        """Array version of calculate_performance_factor."""
+        current_pace = np.asarray(current_pace, dtype=float)
+        baseline_pace = np.asarray(baseline_pace, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            factor = current_pace / baseline_pace
+        return np.where(baseline_pace == 0, 1.0, factor)
+
+    @staticmethod
+    def calculate_dynamic_remaining_minutes_vec(avg_minutes, current_minutes, current_fouls, score_diff, period, performance_factor=1.0):
+        """Array version of calculate_dynamic_remaining_minutes."""
+        current_minutes = np.asarray(current_minutes, dtype=float)
+        current_fouls = np.asarray(current_fouls)
+        abs_diff = np.abs(np.asarray(score_diff))
+
+        base_remaining = np.maximum(0, np.asarray(avg_minutes, dtype=float) - current_minutes)
+        # --- Foul Trouble and Blowout Adjustments: one _MOD_TABLE lookup per player ---
+        fouls_index = np.minimum(current_fouls, _MAX_FOULS).astype(np.intp)
+        blowout_index = np.searchsorted(_BLOWOUT_EDGES, abs_diff, side='left')
+        modifier = _MOD_TABLE[min(period, _MAX_PERIOD)][fouls_index, blowout_index]
+
+        # --- Hot Hand Adjustment ---
+        hot_hand_weight = 0.1 if period >= 3 else 0.2
+        hot_hand_mod = np.log(np.clip(performance_factor, 0.5, 2.0))
+        hot_hand_mod *= hot_hand_weight
+        hot_hand_mod += 1.0
+
+        expected_remaining = base_remaining * modifier * hot_hand_mod
+
+        max_possible = 48.0 - current_minutes
+        if period >= 3:
+            max_possible = np.minimum(max_possible, 12.0)
+
+        return np.where(base_remaining == 0, 0.0, np.minimum(expected_remaining, max_possible))
+
+    @staticmethod
+    def calculate_pfs_vec(current_stat, baseline_pace, expected_remaining_min, period=1):
+        """Array version of calculate_pfs."""
+        efficiency_mod = 0.90 if period >= 3 else 1.0
+        future_production = np.asarray(baseline_pace, dtype=float) * expected_remaining_min * efficiency_mod
+        return current_stat + future_production
+
+    @staticmethod
+    def get_prediction_range_vec(pfs, sigma, minutes_played, avg_minutes, current_stat=0):
+        """Array version of get_prediction_range."""
+        pfs = np.asarray(pfs, dtype=float)
+        sigma = np.asarray(sigma, dtype=float)
+        avg_minutes = np.asarray(avg_minutes, dtype=float)
+
+        # Fresh arrays are made once and then updated in place, so each step of the
+        # chain doesn't allocate another temporary
+        adjusted_sigma = np.where(sigma == 0, pfs * 0.2, sigma)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            remaining_pct = np.where(avg_minutes > 0, (avg_minutes - minutes_played) / avg_minutes, 0.0)
+        np.maximum(remaining_pct, 0, out=remaining_pct)
+        decay_factor = np.sqrt(remaining_pct, out=remaining_pct)
+
+        adjusted_sigma = adjusted_sigma * decay_factor  # decay may broadcast to a larger shape
+
+        low = pfs - adjusted_sigma
+        high = adjusted_sigma * 2.0
+        high += pfs
+
+        np.maximum(low, current_stat, out=low)
+        np.maximum(high, low, out=high)
+
+        return low, high, adjusted_sigma
+
+    @staticmethod
+    def predict_stats_vec(current_stats, baselines, sigmas, minutes_played, avg_minutes, current_fouls, score_diff, period):
+        """
+        Runs the whole projection for PTS, REB and AST in one call.
+
+        `current_stats`, `baselines` and `sigmas` hold (PTS, REB, AST) on their last axis;
+        the other inputs have one value per player and broadcast across it. Points pace
+        drives the Hot Hand factor. Returns (pfs, low, high, performance_factor, remaining_minutes).
+        """
+        current_stats = np.asarray(current_stats, dtype=float)
+        baselines = np.asarray(baselines, dtype=float)
+        minutes_played = np.asarray(minutes_played, dtype=float)
+        avg_minutes = np.asarray(avg_minutes, dtype=float)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            current_pace_pts = np.where(minutes_played > 0, current_stats[..., 0] / minutes_played, 0)
+
+        performance_factor = PredictionEngine.calculate_performance_factor_vec(current_pace_pts, baselines[..., 0])
+        remaining_minutes = PredictionEngine.calculate_dynamic_remaining_minutes_vec(
+            avg_minutes, minutes_played, current_fouls, score_diff, period, performance_factor
+        )
+        pfs = PredictionEngine.calculate_pfs_vec(current_stats, baselines, remaining_minutes[..., None], period)
+        low, high, _ = PredictionEngine.get_prediction_range_vec(
+            pfs, sigmas, minutes_played[..., None], avg_minutes[..., None], current_stats
+        )
+        return pfs, low, high, performance_factor, remaining_minutes
@@ -0,0 +1,26 @@
+import threading
+import time
+
+class RateLimiter:
+    """
+    Spaces out API calls across threads.
+
+    Each caller reserves the next free slot (at least `interval` seconds after
+    the previous one) and sleeps until it arrives, so concurrent workers share
+    a single request budget instead of each sleeping on their own.
+    """
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        """Blocks until the caller is allowed to issue its request."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
@@ -1,17 +1,63 @@
 import time
-import json
-import pandas as pd
+import threading
+import numpy as np
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from nba_api.stats.endpoints import scoreboardv2, playercareerstats, playergamelog, commonteamroster, leaguedashteamstats
 from nba_api.stats.static import players
+import lib.cache as cache
 import lib.constants as constants
+import lib.fast_json as fast_json
+from lib.rate_limiter import RateLimiter
+from lib.utils import parse_tipoff, summarize_recent_logs
+
+SEASON = constants.SEASON
+GAME_LOG_COLUMNS = ['GAME_DATE', 'MIN', 'PTS', 'REB', 'AST']  # Saved per player for offline backtests
+PLAYER_WORKERS = 8  # Players researched concurrently
+# On-disk cache lifetimes (seconds); season-to-date stats change at most once a day
+CAREER_TTL = 24 * 3600
+GAMELOG_TTL = 24 * 3600
+SCHEDULE_TTL = 15 * 60  # Repeated game checks through the day reuse the schedule this long
+SCHEDULE_COLUMNS = ['GAME_ID', 'HOME_TEAM_ID', 'VISITOR_TEAM_ID', 'GAME_DATE_EST', 'GAME_STATUS_TEXT']
+
+# Researcher calls run on worker threads, so they share one request budget
+API_LIMITER = RateLimiter(constants.API_DELAY)
+PLAYER_EXECUTOR = ThreadPoolExecutor(max_workers=PLAYER_WORKERS)
+
+def _fetch_season_totals(player_id):
+    def fetch():
+        API_LIMITER.wait()
+        career = playercareerstats.PlayerCareerStats(player_id=player_id, timeout=10)
+        return career.season_totals_regular_season.get_data_frame()
+    return cache.get_or_fetch(f"career:{player_id}:{SEASON}", fetch, CAREER_TTL)
+
+def _fetch_schedule(game_date):
+    """(game_id, home_team_id, visitor_team_id, game_date_est, status_text) rows, read without a DataFrame."""
+    def fetch():
+        API_LIMITER.wait()
+        board = scoreboardv2.ScoreboardV2(game_date=game_date, timeout=10)
+        raw = board.game_header.get_dict()
+        col = {name: i for i, name in enumerate(raw['headers'])}
+        indexes = [col[name] for name in SCHEDULE_COLUMNS]
+        return [tuple(row[i] for i in indexes) for row in raw['data']]
+    return cache.get_or_fetch(f"schedule:{game_date}:rows", fetch, SCHEDULE_TTL)
+
+def _fetch_game_log(player_id):
+    def fetch():
+        API_LIMITER.wait()
+        gamelog = playergamelog.PlayerGameLog(player_id=player_id, season=SEASON, timeout=10)
+        return gamelog.player_game_log.get_data_frame()
+    return cache.get_or_fetch(f"gamelog:{player_id}:{SEASON}", fetch, GAMELOG_TTL)
 
 class Researcher:
     def __init__(self):
         self.today_games = []
+        self.game_tipoffs = {}
         self.player_baselines = {}
         self.team_def_ratings = {}
+        self._baselines_lock = threading.Lock()
+        self._seen_players = set()
 
     def run(self):
         print(f"[{datetime.now()}] Starting Researcher...")
@@ -35,22 +81,22 @@ class Researcher:
         print("Fetching Team Stats (Defense & Pace)...")
         try:
             # 1. Fetch Advanced Team Stats (for PACE)
+            API_LIMITER.wait()
             teams_adv = leaguedashteamstats.LeagueDashTeamStats(
-                season='2024-25',
+                season=SEASON,
                 measure_type_detailed_defense='Advanced',
                 timeout=10
             )
             df_adv = teams_adv.league_dash_team_stats.get_data_frame()
-            time.sleep(constants.API_DELAY)
 
             # 2. Fetch Opponent Stats (for OPP_PTS, OPP_REB, OPP_AST)
+            API_LIMITER.wait()
             teams_opp = leaguedashteamstats.LeagueDashTeamStats(
-                season='2024-25',
+                season=SEASON,
                 measure_type_detailed_defense='Opponent',
                 timeout=10
             )
             df_opp = teams_opp.league_dash_team_stats.get_data_frame()
-            time.sleep(constants.API_DELAY)
             
             if not df_adv.empty and not df_opp.empty:
                 # Calculate League Averages
@@ -61,25 +107,22 @@ class Researcher:
 
                 print(f"League Averages - Pace: {avg_pace:.2f}, OppPTS: {avg_opp_pts:.1f}, OppREB: {avg_opp_reb:.1f}, OppAST: {avg_opp_ast:.1f}")
 
-                # Merge or iterate to store
-                # Both DFs should have TEAM_ID as unique identifier
-                
-                for _, row in df_adv.iterrows():
-                    team_id = row['TEAM_ID']
-                    # Find corresponding row in df_opp
-                    opp_row = df_opp[df_opp['TEAM_ID'] == team_id].iloc[0]
-                    
-                    self.team_def_ratings[team_id] = {
-                        'pace': row['PACE'],
-                        'opp_pts': opp_row['OPP_PTS'],
-                        'opp_reb': opp_row['OPP_REB'],
-                        'opp_ast': opp_row['OPP_AST'],
-                        # Store averages for easy access later
-                        'league_avg_pace': avg_pace,
-                        'league_avg_opp_pts': avg_opp_pts,
-                        'league_avg_opp_reb': avg_opp_reb,
-                        'league_avg_opp_ast': avg_opp_ast
-                    }
+                # Both DFs have TEAM_ID as unique identifier, so one merge lines them up
+                merged = df_adv[['TEAM_ID', 'PACE']].merge(
+                    df_opp[['TEAM_ID', 'OPP_PTS', 'OPP_REB', 'OPP_AST']], on='TEAM_ID'
+                ).rename(columns={
+                    'PACE': 'pace',
+                    'OPP_PTS': 'opp_pts',
+                    'OPP_REB': 'opp_reb',
+                    'OPP_AST': 'opp_ast'
+                }).assign(
+                    # Store averages for easy access later
+                    league_avg_pace=avg_pace,
+                    league_avg_opp_pts=avg_opp_pts,
+                    league_avg_opp_reb=avg_opp_reb,
+                    league_avg_opp_ast=avg_opp_ast
+                )
+                self.team_def_ratings.update(merged.set_index('TEAM_ID').to_dict('index'))
                 print(f"Fetched detailed stats for {len(self.team_def_ratings)} teams.")
             else:
                 print("Could not fetch team stats.")
@@ -92,8 +135,7 @@ class Researcher:
         if not os.path.exists(constants.BASELINES_FILE):
             return False
         try:
-            with open(constants.BASELINES_FILE, 'r') as f:
-                data = json.load(f)
+            data = fast_json.load_file(constants.BASELINES_FILE)
             
             # Check metadata
             if '_meta' in data:
@@ -111,63 +153,88 @@ class Researcher:
         print("Fetching today's schedule...")
         try:
             # ScoreboardV2 gets games for a specific date
-            board = scoreboardv2.ScoreboardV2(game_date=datetime.now().strftime('%Y-%m-%d'), timeout=10)
-            games_df = board.game_header.get_data_frame()
+            schedule = _fetch_schedule(datetime.now().strftime('%Y-%m-%d'))
             
             # Filter for games that haven't finished (though usually we run this in AM)
             # For simplicity, we take all games listed for the day
-            self.today_games = games_df[['GAME_ID', 'HOME_TEAM_ID', 'VISITOR_TEAM_ID']].to_dict('records')
+            # (game_id, home_team_id, visitor_team_id) tuples
+            self.today_games = [(game_id, home, visitor) for game_id, home, visitor, _, _ in schedule]
+            # {game_id: tip-off datetime}; games already under way have no time listed
+            self.game_tipoffs = {
+                game_id: parse_tipoff(game_date, status)
+                for game_id, _, _, game_date, status in schedule
+            }
             print(f"Found {len(self.today_games)} games.")
-            time.sleep(constants.API_DELAY)
         except Exception as e:
             print(f"Error fetching schedule: {e}")
 
     def build_baselines(self):
         """Iterates through games and players to build statistical baselines."""
-        for game in self.today_games:
-            game_id = game['GAME_ID']
-            home_team = game['HOME_TEAM_ID']
-            visitor_team = game['VISITOR_TEAM_ID']
-            
+        # Rosters are fetched concurrently too; each one queues its players as soon as it arrives,
+        # so player fetches from every team share one pipeline and nothing waits for a team to finish
+        roster_futures = []
+        for game_id, home_team, visitor_team in self.today_games:
             print(f"Processing Game ID: {game_id}")
             # Process Home Team (vs Visitor)
-            self._process_team(home_team, is_home=True, opponent_id=visitor_team)
+            roster_futures.append(PLAYER_EXECUTOR.submit(self._process_team, home_team, True, visitor_team))
             # Process Visitor Team (vs Home)
-            self._process_team(visitor_team, is_home=False, opponent_id=home_team)
+            roster_futures.append(PLAYER_EXECUTOR.submit(self._process_team, visitor_team, False, home_team))
+
+        futures = {}
+        for roster_future in roster_futures:
+            futures.update(roster_future.result())
+
+        for future in as_completed(futures):
+            result = future.result()
+            if result:
+                player_id, player_name, team_id = futures[future]
+                stats, raw = result
+                with self._baselines_lock:
+                    self.player_baselines[str(player_id)] = {
+                        'name': player_name,
+                        'team_id': team_id,
+                        'stats': stats,
+                        'raw': raw
+                    }
 
     def _process_team(self, team_id, is_home, opponent_id):
-        """Fetches roster and stats for a specific team."""
+        """Fetches a team's roster and queues its players; returns {future: (player_id, name, team_id)}."""
+        futures = {}
         try:
+            API_LIMITER.wait()
             roster = commonteamroster.CommonTeamRoster(team_id=team_id, timeout=10)
-            roster_df = roster.common_team_roster.get_data_frame()
-            time.sleep(constants.API_DELAY)
+            # Only two columns are needed, so read the raw rows rather than building a DataFrame
+            raw = roster.common_team_roster.get_dict()
+            i_id, i_name = raw['headers'].index('PLAYER_ID'), raw['headers'].index('PLAYER')
 
-            for _, player in roster_df.iterrows():
-                player_id = player['PLAYER_ID']
-                player_name = player['PLAYER']
-                
-                # Skip if we already have data (e.g. player traded or duplicate check)
-                if str(player_id) in self.player_baselines:
-                    continue
+            # Skip players we have already queued (e.g. player traded or duplicate check)
+            roster_players = []
+            with self._baselines_lock:
+                for row in raw['data']:
+                    player_id, player_name = row[i_id], row[i_name]
+                    if player_id not in self._seen_players:
+                        self._seen_players.add(player_id)
+                        roster_players.append((player_id, player_name))
 
+            # Players are fetched concurrently; API_LIMITER keeps the request rate in check
+            for player_id, player_name in roster_players:
                 print(f"  Analyzing {player_name} ({player_id})...")
-                stats = self._get_player_stats(player_id, is_home, opponent_id)
-                if stats:
-                    self.player_baselines[str(player_id)] = {
-                        'name': player_name,
-                        'team_id': team_id,
-                        'stats': stats
-                    }
+                future = PLAYER_EXECUTOR.submit(self._get_player_stats, player_id, is_home, opponent_id)
+                futures[future] = (player_id, player_name, team_id)
         except Exception as e:
             print(f"Error processing team {team_id}: {e}")
+        return futures
 
     def _get_player_stats(self, player_id, is_home, opponent_id):
-        """Calculates baseline pace and standard deviation for a player."""
+        """
+        Calculates baseline pace and standard deviation for a player.
+
+        Returns (stats, raw), where raw holds the unadjusted season totals and game
+        log so backtests can redo the date/home/DvP math without the API.
+        """
         try:
             # 1. Get Season Averages (Baseline Pace)
-            career = playercareerstats.PlayerCareerStats(player_id=player_id, timeout=10)
-            season_df = career.season_totals_regular_season.get_data_frame()
-            time.sleep(constants.API_DELAY)
+            season_df = _fetch_season_totals(player_id)
 
             if season_df.empty:
                 return None
@@ -188,22 +255,19 @@ class Researcher:
             avg_minutes = minutes / games_played
 
             # 2. Get Recent Game Logs for Variance AND Weighted Baseline
-            gamelog = playergamelog.PlayerGameLog(player_id=player_id, season='2024-25', timeout=10)
-            logs_df = gamelog.player_game_log.get_data_frame()
-            time.sleep(constants.API_DELAY)
+            logs_df = _fetch_game_log(player_id)
 
             # --- Weighted Baseline Calculation ---
             # Weight: 70% Season, 30% Last 5 Games
             # If < 5 games played, rely on season.
             
             if not logs_df.empty:
-                last_5 = logs_df.head(5)
-                l5_min = last_5['MIN'].sum()
+                # Last-5 totals and last-20 sigmas come out of one NumPy pass over the log
+                l5_totals, l20_sigmas = summarize_recent_logs(logs_df)
+                l5_min = l5_totals[0]
                 
                 if l5_min > 0:
-                    l5_pts_min = last_5['PTS'].sum() / l5_min
-                    l5_reb_min = last_5['REB'].sum() / l5_min
-                    l5_ast_min = last_5['AST'].sum() / l5_min
+                    l5_pts_min, l5_reb_min, l5_ast_min = l5_totals[1:] / l5_min
                     
                     # Blend
                     baseline_pts_min = (0.7 * season_pts_min) + (0.3 * l5_pts_min)
@@ -250,16 +314,10 @@ class Researcher:
                 sigma_reb = 0
                 sigma_ast = 0
             else:
-                recent_logs = logs_df.head(20)
-                sigma_pts = recent_logs['PTS'].std()
-                sigma_reb = recent_logs['REB'].std()
-                sigma_ast = recent_logs['AST'].std()
-
-            sigma_pts = 0 if pd.isna(sigma_pts) else sigma_pts
-            sigma_reb = 0 if pd.isna(sigma_reb) else sigma_reb
-            sigma_ast = 0 if pd.isna(sigma_ast) else sigma_ast
+                # Fewer than 2 games gives no spread
+                sigma_pts, sigma_reb, sigma_ast = np.nan_to_num(l20_sigmas).tolist()
 
-            return {
+            stats = {
                 'baseline_pts_min': baseline_pts_min,
                 'baseline_reb_min': baseline_reb_min,
                 'baseline_ast_min': baseline_ast_min,
@@ -268,6 +326,11 @@ class Researcher:
                 'sigma_reb': sigma_reb,
                 'sigma_ast': sigma_ast
             }
+            raw = {
+                'season_totals': {key: float(current_season[key]) for key in ('MIN', 'GP', 'PTS', 'REB', 'AST')},
+                'game_log': [] if logs_df.empty else logs_df[GAME_LOG_COLUMNS].to_dict('records')
+            }
+            return stats, raw
 
         except Exception as e:
             print(f"    Error fetching stats for {player_id}: {e}")
@@ -282,14 +345,16 @@ class Researcher:
             output = {
                 '_meta': {
                     'date': datetime.now().strftime('%Y-%m-%d'),
+                    'season': SEASON,
                     'timestamp': time.time()
                 },
                 'players': self.player_baselines
             }
 
-            with open(constants.BASELINES_FILE, 'w') as f:
-                json.dump(output, f, indent=4)
+            fast_json.dump_file(constants.BASELINES_FILE, output)
             print(f"Baselines saved to {constants.BASELINES_FILE}")
+            if constants.WRITE_PRETTY_BASELINES:
+                fast_json.dump_file(constants.BASELINES_PRETTY_FILE, output, pretty=True)
         except Exception as e:
             print(f"Error saving baselines: {e}")
 
@@ -0,0 +1,81 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+import numpy as np
+import pandas as pd
+
+GAME_DATE_FORMAT = '%b %d, %Y'  # PlayerGameLog GAME_DATE, matched case-insensitively
+NBA_TIMEZONE = ZoneInfo('America/New_York')  # ScoreboardV2 dates and tip-off times are Eastern
+
+def parse_tipoff(game_date_est, status_text):
+    """
+    Tip-off time from a ScoreboardV2 GameHeader row ("2025-10-21T00:00:00", "7:30 pm ET").
+    Returns None once the status text is no longer a time, i.e. the game has started.
+    """
+    try:
+        tipoff = datetime.strptime(f"{game_date_est[:10]} {status_text.strip()}", '%Y-%m-%d %I:%M %p ET')
+    except (TypeError, ValueError):
+        return None
+    return tipoff.replace(tzinfo=NBA_TIMEZONE)
+
+def parse_minutes_col(minutes):
+    """Vectorized parse_minutes for a Series of "MM:SS" strings; missing/malformed values become 0.0."""
+    split = minutes.astype('string').str.split(':', n=1, expand=True).reindex(columns=[0, 1])
+    mins = pd.to_numeric(split[0], errors='coerce')
+    secs = pd.to_numeric(split[1], errors='coerce')
+    return (mins + secs / 60).fillna(0.0).astype(float)
+
+def prepare_game_log(logs_df):
+    """Parses GAME_DATE once into `date_dt` and sorts the log newest first."""
+    if logs_df.empty:
+        return logs_df
+    # GAME_DATE is formatted like "APR 11, 2025". pandas cannot infer that format and
+    # falls back to dateutil per element, so spell it out
+    logs_df['date_dt'] = pd.to_datetime(logs_df['GAME_DATE'], format=GAME_DATE_FORMAT)
+    return logs_df.sort_values('date_dt', ascending=False, kind='stable').reset_index(drop=True)
+
+def games_before(logs_df, game_date):
+    """
+    Returns (past_logs, cutoff) for a log from prepare_game_log: the games played before
+    game_date, newest first, and the row where they start.
+    """
+    if logs_df.empty:
+        return pd.DataFrame(), 0
+    # Logs are newest first, so games before the date are a suffix of the frame
+    oldest_first = logs_df['date_dt'].to_numpy()[::-1]
+    target_dt = pd.Timestamp(game_date).to_datetime64()
+    cutoff = len(logs_df) - int(np.searchsorted(oldest_first, target_dt, side='left'))
+    return logs_df.iloc[cutoff:], cutoff
+
+def summarize_recent_logs(past_logs):
+    """
+    Reduces a newest-first game log to what the baseline math needs, in one NumPy pass.
+
+    Returns (l5_totals, l20_sigmas): MIN/PTS/REB/AST totals over the last 5 games, and the
+    sample std of PTS/REB/AST over the last 20 (NaN with fewer than 2 games).
+    """
+    recent = past_logs[['MIN', 'PTS', 'REB', 'AST']].head(20).to_numpy(dtype=float)
+    l5_totals = np.nansum(recent[:5], axis=0)
+    if len(recent) < 2:
+        return l5_totals, np.full(3, np.nan)
+    return l5_totals, np.nanstd(recent[:, 1:], axis=0, ddof=1)
+
+BOXSCORE_DTYPES = {
+    'personId': 'int32', 'teamId': 'int32',
+    'points': 'int16', 'reboundsTotal': 'int16', 'assists': 'int16', 'foulsPersonal': 'int8',
+}
+BOXSCORE_NAME_COLUMNS = ['firstName', 'familyName']
+
+def narrow_boxscore(df):
+    """
+    Projects a BoxScoreTraditionalV3 player frame onto the columns the backtests use,
+    with narrow integer dtypes and categorical names. `minutes` stays a "MM:SS" string.
+    """
+    if df.empty:
+        return df
+    names = [col for col in BOXSCORE_NAME_COLUMNS if col in df.columns]
+    df = df[list(BOXSCORE_DTYPES) + ['minutes'] + names].copy()
+    # Players who did not play can come back with null counting stats
+    df = df.fillna({col: 0 for col in BOXSCORE_DTYPES}).astype(BOXSCORE_DTYPES)
+    for col in names:
+        df[col] = df[col].astype('category')
+    return df
@@ -19,23 +19,15 @@ def list_games():
         print(f"{'GAME ID':<12} | {'VISITOR':<5} @ {'HOME':<5} | {'STATUS'}")
         print("-" * 45)
 
-        for _, game in games.iterrows():
-            game_id = game['GAME_ID']
-            home_id = game['HOME_TEAM_ID']
-            visitor_id = game['VISITOR_TEAM_ID']
-            status = game['GAME_STATUS_TEXT'] # e.g. "7:30 pm ET" or "Final"
-            
-            home_team = game["GAMECODE"][-3:] 
-            visitor_team = game["GAMECODE"][-6:-3]
-            
-            if not line_score.empty:
-                h_data = line_score[line_score['teamId  '] == home_id]
-                v_data = line_score[line_score['TEAM_ID'] == visitor_id]
-                
-                if not h_data.empty:
-                    home_team = h_data.iloc[0]['TEAM_ABBREVIATION']
-                if not v_data.empty:
-                    visitor_team = v_data.iloc[0]['TEAM_ABBREVIATION']
+        # Team abbreviations keyed by team id, built once for the whole slate
+        abbr_by_id = dict(zip(line_score['TEAM_ID'], line_score['TEAM_ABBREVIATION'])) if not line_score.empty else {}
+
+        # status is e.g. "7:30 pm ET" or "Final"
+        columns = ['GAME_ID', 'HOME_TEAM_ID', 'VISITOR_TEAM_ID', 'GAME_STATUS_TEXT', 'GAMECODE']
+        for game_id, home_id, visitor_id, status, gamecode in games[columns].itertuples(index=False, name=None):
+            # Fall back to the GAMECODE suffix (e.g. "20251201/AAABBB") when a team has no line score
+            home_team = abbr_by_id.get(home_id, gamecode[-3:])
+            visitor_team = abbr_by_id.get(visitor_id, gamecode[-6:-3])
 
             print(f"{game_id:<12} | {visitor_team:<5} @ {home_team:<5} | {status}")
         print("-" * 45)
@@ -1,11 +1,19 @@
-import time
-import schedule
-from datetime import datetime
+import asyncio
+import logging
+import traceback
+from datetime import datetime, timedelta, timezone
 from lib.researcher import Researcher
-from lib.poller import Poller
+from lib.poller import Poller, shared_baselines
 
-# Track active pollers: {game_id: PollerThread}
+# Track active pollers: {game_id: asyncio.Task running Poller.run()}
 active_pollers = {}
+# Games whose poller has finished, so later checks don't start them again
+finished_games = set()
+# Other fire-and-forget tasks, referenced so they aren't garbage collected mid-run
+background_tasks = set()
+
+POLLER_LEAD_TIME = timedelta(minutes=30)  # Start a game's poller this long before tip-off
+CHECK_GAMES_INTERVAL = 300  # Seconds between schedule checks
 
 def job_research():
     """Runs the daily research task."""
@@ -13,7 +21,7 @@ def job_research():
     r = Researcher()
     r.run()
 
-def job_check_games():
+async def job_check_games():
     """Checks for live games and spawns pollers."""
     print(f"[{datetime.now()}] Checking for live games...")
     
@@ -22,54 +30,84 @@ def job_check_games():
     # For simplicity, let's just instantiate Researcher to get the schedule.
     # In a real app, we might cache the schedule.
     r = Researcher()
-    r.fetch_todays_games()
-    
-    for game in r.today_games:
-        game_id = game['GAME_ID']
-        
+    await asyncio.to_thread(r.fetch_todays_games)
+
+    for game_id, home_team_id, visitor_team_id in r.today_games:
         # If poller already running, skip
         if game_id in active_pollers:
-            if not active_pollers[game_id].is_alive():
+            if active_pollers[game_id].done():
                 print(f"Poller for {game_id} finished. Removing.")
                 del active_pollers[game_id]
+                finished_games.add(game_id)
+            continue
+        if game_id in finished_games:
+            continue
+
+        # Start new poller only close to tip-off; a later check picks up games hours away.
+        # Games already under way have no tip-off listed and start right away.
+        # The Poller class still handles the "wait until live" logic (it checks status).
+        tipoff = r.game_tipoffs.get(game_id)
+        if tipoff is not None and tipoff - datetime.now(timezone.utc) > POLLER_LEAD_TIME:
             continue
 
-        # Start new poller
-        # Note: In a real scenario, we'd check if the game status is actually live 
-        # BEFORE spawning the thread to save resources, but the Poller class 
-        # handles the "wait until live" logic too (it checks status).
-        # However, spawning threads for games 5 hours away is wasteful.
-        # Let's assume we only spawn if it's close to start time or live.
-        # For this MVP, we'll spawn and let the Poller sleep if not live.
-        
         print(f"Spawning Poller for Game {game_id}")
-        p = Poller(game_id, game['HOME_TEAM_ID'], game['VISITOR_TEAM_ID'])
-        p.start()
-        active_pollers[game_id] = p
+        # Every poller shares one read-only baselines table, reloaded only when the file changes
+        p = Poller(game_id, home_team_id, visitor_team_id, baselines=shared_baselines())
+        active_pollers[game_id] = asyncio.create_task(p.run())
 
-def main():
-    print("Hello Buddard Bot Starting...")
-    
+def spawn(make_coro):
+    """Starts make_coro() as a background task on the running loop."""
+    task = asyncio.create_task(make_coro())
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+async def periodic(job, interval):
+    """Runs the coroutine function `job` every `interval` seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await job()
+        except Exception:
+            # One failed run (bad baselines file, alerts dir unwritable) mustn't stop later ones
+            print(f"Error in {job.__name__}:\n{traceback.format_exc()}")
+
+async def daily_at(time_of_day, job):
+    """Runs the blocking function `job` off the event loop every day at local "HH:MM"."""
+    hour, minute = map(int, time_of_day.split(":"))
+    while True:
+        now = datetime.now()
+        next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        # Sleep straight through to the next run instead of waking up to check
+        await asyncio.sleep((next_run - now).total_seconds())
+        try:
+            await asyncio.to_thread(job)
+        except Exception:
+            # run_bot awaits this loop, so an escaping error would stop the bot and every poller
+            print(f"Error in {job.__name__}:\n{traceback.format_exc()}")
+
+async def run_bot():
     # Run research immediately on startup to populate baselines
-    job_research()
-    job_check_games()
+    await asyncio.to_thread(job_research)
+    await job_check_games()
 
-    # Schedule daily research
-    schedule.every().day.at("08:00").do(job_research)
+    # Schedule game checks every 5 minutes, so pollers start as tip-off approaches
+    spawn(lambda: periodic(job_check_games, CHECK_GAMES_INTERVAL))
 
-    # Schedule game checks every 5 minutes
-    # schedule.every(5).minutes.do(job_check_games)
+    # Schedule daily research; it blocks for minutes, so it runs off the event loop
+    await daily_at("08:00", job_research)
+
+def main():
+    # Poller near-miss projections log at DEBUG; lower the level to see them
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+    print("Hello Buddard Bot Starting...")
 
     try:
-        while True:
-            schedule.run_pending()
-            time.sleep(1)
+        # Pollers are tasks on this loop; stopping it cancels them
+        asyncio.run(run_bot())
     except KeyboardInterrupt:
         print("Stopping bot...")
-        # Stop all pollers
-        for gid, poller in active_pollers.items():
-            poller.running = False
-            poller.join()
         print("Bot stopped.")
         raise SystemExit
 
@@ -1,10 +1,11 @@
 import argparse
-from lib.poller import Poller
+import asyncio
+import logging
+from lib.poller import Poller, shared_baselines
 from nba_api.live.nba.endpoints import boxscore
 
 def start_poller(game_id):
     print(f"Initializing poller for Game ID: {game_id}")
-    p = None
     
     try:
         # 1. Fetch Game Details to get Team IDs
@@ -29,25 +30,18 @@ def start_poller(game_id):
         visitor_name = data['game']['awayTeam']['teamName']
         
         print(f"Matchup Found: {visitor_name} @ {home_name}")
-        print("Starting Poller Thread...")
+        print("Starting Poller...")
         print("Press Ctrl+C to stop.")
         print("-" * 30)
 
-        # 2. Start Poller
-        # We run the poller in a separate thread (as designed), 
-        # but keep the main script alive to handle shutdown.
-        p = Poller(game_id, home_team_id, visitor_team_id)
-        p.start()
-
-        # 3. Keep Main Thread Alive
-        while p.is_alive():
-            p.join(1.0) # Join with timeout to allow KeyboardInterrupt
+        # 2. Run Poller
+        # Poller.run is a coroutine (main.py runs many on one loop); here it gets its own
+        # loop until the game is final. Ctrl+C cancels it.
+        p = Poller(game_id, home_team_id, visitor_team_id, baselines=shared_baselines())
+        asyncio.run(p.run())
 
     except KeyboardInterrupt:
         print("\n[User Interrupt] Stopping poller...")
-        if p:
-          p.running = False
-          p.join()
         print("Poller stopped safely.")
     except Exception as e:
         print(f"Unexpected error: {e}")
@@ -55,6 +49,8 @@ def start_poller(game_id):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Start the Buddard Prediction Poller for a specific game.')
     parser.add_argument('game_id', type=str, help='The 10-digit NBA Game ID (e.g., 0022400123)')
+    parser.add_argument('--debug', action='store_true', help='Also log near-miss projections')
     
     args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO, format="[%(levelname)s] %(message)s")
     start_poller(args.game_id)